@@ -4,6 +4,8 @@ import streamlit as st
 
 from dotenv import load_dotenv
 
+from utils.perf_utils import section
+
 # Initialize the Groq client
 load_dotenv()
 api_key = os.getenv("GROQ_API_KEY") # Add your API Key Here
@@ -63,7 +65,7 @@ def chatbot():
         st.session_state["messages"].append({"role": "user", "content": user_input})
 
         # Generate AI response
-        with st.spinner("Thinking..."):
+        with st.spinner("Thinking..."), section("llm.completion"):
             try:
                 response = client.chat.completions.create(
                     messages=st.session_state["messages"],
@@ -1,8 +1,15 @@
+import os
 import streamlit as st
 import pandas as pd
 
 # Data Cleaning Imports
-from utils.data_cleaner import DataCleaner as dc
+from utils.data_preview import paginated_preview
+from utils.export_utils import download_panel
+from utils.session_utils import init_session_state, load_uploaded_files, get_df, get_sketch, apply_step, start_sample_mode, start_out_of_core
+from utils.ingest import UPLOAD_TYPES
+from utils.sample_mode import DEFAULT_SAMPLE_SIZE
+from utils.widgets_utils import sample_mode_status, column_stats_caption, outlier_bounds_caption
+from utils.perf_utils import start_rerun, finish_rerun, section, debug_panel
 
 # Data Visualization
 from dashboard import Dashboard
@@ -15,6 +22,9 @@ import io
 # AI chatbot func import
 from ai import chatbot
 
+# Copy-on-write lets every session share the stored base DataFrames safely
+pd.set_option("mode.copy_on_write", True)
+
 # Page Configuration
 st.set_page_config(
     page_title="VisWalis",
@@ -26,11 +36,11 @@ st.set_page_config(
     }
 )
 
-# Initialize session state for DataFrame and uploaded file name
-if 'df' not in st.session_state:
-    st.session_state.df = None
-if 'uploaded_file_name' not in st.session_state:
-    st.session_state.uploaded_file_name = None
+# Initialize session state for DataFrame, its version and uploaded file name
+init_session_state()
+
+# Start timing this rerun (no-op unless profiling is on)
+start_rerun()
 
 # Tabs
 tab1, tab2, tab3, tab4 = st.tabs(["Data Cleaning", "Dashboard", "Report", "Ask AI"])
@@ -41,63 +51,131 @@ st.sidebar.subheader("🧹 Brushing Off the Mess, 🌟 Visualizing Success!", an
 st.sidebar.write("VisWalis simplifies data analysis. Upload a CSV, let us clean it, and explore interactive visualizations.")
 st.sidebar.divider()
 
-# File uploader
-csv_file = st.sidebar.file_uploader("Upload a CSV file", type=["csv"])
+# Debug panel with the per-rerun profile (shown when VISWALIS_DEBUG or VISWALIS_PROFILE is set)
+debug_expander = None
+if os.getenv("VISWALIS_DEBUG") or os.getenv("VISWALIS_PROFILE"):
+    debug_expander = st.sidebar.expander("🐞 Debug")
+    debug_expander.toggle("Profile reruns", key="profile_reruns")
+
+# File uploader (several files, e.g. monthly shards, are combined into one dataset)
+uploaded_files = st.sidebar.file_uploader(
+    "Upload CSV files",
+    type=UPLOAD_TYPES,
+    accept_multiple_files=True,
+    help="CSV, compressed CSV (.csv.gz, .csv.zst), Parquet or JSON Lines.",
+)
 
-# Check if a new file is uploaded
-if csv_file:
-    if st.session_state.uploaded_file_name != csv_file.name:
-        st.session_state.df = pd.read_csv(csv_file)
-        st.session_state.uploaded_file_name = csv_file.name
-        alert = f"Loaded new CSV: {csv_file.name}"
-else:
+# Check if new files are uploaded
+if uploaded_files:
+    uploaded_file_ids = [uploaded_file.file_id for uploaded_file in uploaded_files]
+    if uploaded_file_ids not in (st.session_state.uploaded_file_ids, st.session_state.failed_upload_ids):
+        # Parsed concurrently, once per unique set of files, and shared across sessions
+        try:
+            load_uploaded_files(uploaded_files)
+            st.session_state.failed_upload_ids = None
+            alert = f"Loaded new data: {st.session_state.uploaded_file_name}"
+        except Exception as e:
+            # e.g. a compressed file that is not CSV or JSON Lines (data.tar.gz); shown once
+            st.session_state.failed_upload_ids = uploaded_file_ids
+            st.sidebar.error(f"Error: {str(e)}")
+elif st.session_state.ooc_cleaner is None:
     st.warning('Please load a CSV File!', icon="⚠️")
 
+# Out-of-Core Mode: clean files larger than memory from the server's disk (enabled by VISWALIS_OOC_DIR)
+ooc_dir = os.getenv("VISWALIS_OOC_DIR")
+if ooc_dir:
+    with st.sidebar.expander("Out-of-Core Mode"):
+        st.caption(f"Clean a file larger than memory chunk by chunk. Only a preview is loaded. Files are read from `{ooc_dir}`.")
+        ooc_file = st.selectbox("Select a CSV, Parquet or Arrow file:", sorted(os.listdir(ooc_dir)), index=None)
+        if st.button("Open Dataset") and ooc_file:
+            try:
+                start_out_of_core(os.path.join(ooc_dir, ooc_file))
+                alert = f"Opened {ooc_file} out-of-core!"
+            except Exception as e:
+                alert = f"Error: {str(e)}"
+
+# Sample Mode: clean a sample for instant feedback while the full data is replayed in the background
+if st.session_state.dataset_key is not None:
+    with st.sidebar.expander("Sample Mode"):
+        if st.session_state.sample_mode:
+            sample_mode_status()
+        else:
+            st.caption("Work on a sample of the data for instant feedback. Cleaning steps are replayed on the full data in the background.")
+            full_df = get_df()
+            sample_size = st.number_input("Sample size (rows):", min_value=100, value=DEFAULT_SAMPLE_SIZE, step=1000)
+            stratify_column = st.selectbox("Stratify by (optional):", full_df.columns, index=None)
+            if st.button("Start Sample Mode"):
+                start_sample_mode(full_df, sample_size, stratify_column)
+                alert = f"Working on a sample of {st.session_state.sample_rows:,} rows!"
+
 # Main Content
-if st.session_state.df is not None:
+df = get_df()
+if df is not None:
+    sketch = get_sketch()  # Approximate column statistics for the column pickers
+
     # Data Cleaning
     with tab1:
         st.header("🧹 Data Cleaning", anchor=False)
         st.write("Prepare and clean your dataset for analysis.")
 
-        # Cleaner instance
-        cleaner = dc(st.session_state.df)
-
         # Display the CSV title
-        st.subheader(f"Loaded CSV: {st.session_state.uploaded_file_name}", anchor=False)
+        st.subheader(f"Loaded Data: {st.session_state.uploaded_file_name}", anchor=False)
+
+        # Out-of-Core Mode status
+        if st.session_state.ooc_cleaner is not None:
+            st.info(f"Out-of-core mode: previewing the first {len(df):,} of {st.session_state.ooc_cleaner.num_rows():,} rows. Cleaning tools run on the whole file on disk.", icon="💽")
+
+        # Sample Mode status and the row counts after switching back to the full data
+        if st.session_state.sample_mode:
+            st.info(f"Sample mode: showing {len(df):,} sampled rows. Steps are being replayed on the full data.", icon="🧪")
+        summary = st.session_state.pop("sample_summary", None)
+        sample_error = st.session_state.pop("sample_error", None)
+        if sample_error:
+            st.error(sample_error)
+        if summary:
+            st.info(
+                f"Switched to the full data: {summary['full_before']:,} → {summary['full_after']:,} rows "
+                f"({summary['full_before'] - summary['full_after']:,} removed). "
+                f"The sample went from {summary['sample_before']:,} → {summary['sample_after']:,} rows "
+                f"({summary['sample_before'] - summary['sample_after']:,} removed).",
+                icon="✅"
+            )
 
         # Layout: Two columns (left for DataFrame, right for tools)
         col1, col2 = st.columns([3, 1])
 
         with col1:
-            # Display the current DataFrame
+            # Display the current DataFrame (only the visible page is sent to the browser)
             st.subheader("Current Data", anchor=False)
-            st.dataframe(st.session_state.df)
+            paginated_preview(df, st.session_state.df_version)
 
         with col2:
-            # Tools Section
+            # Tools Section (a DataCleaner copy is only made when a tool is applied)
             st.subheader("Tools", anchor=False)
             
             btn1, btn2 = st.columns([0.5,0.5])
             with btn1:
                 if st.button("Refresh Table"):
-                    st.session_state.df = st.session_state.df # Refresh the CSV
+                    # Clicking the button reruns the script, refreshing the CSV
                     alert = "Table is Refreshed!"
             with btn2: 
-
-                @st.cache_data
-                def convert_df(df):
-                    # IMPORTANT: Cache the conversion to prevent computation on every rerun
-                    return df.to_csv().encode("utf-8")
-
-                csv = convert_df(st.session_state.df)
-
-                st.download_button(
-                    label="Download CSV",
-                    data=csv,
-                    file_name= f"{st.session_state.uploaded_file_name}[cleaned_data].csv",
-                    mime="text/csv",
-                )
+                if st.session_state.ooc_cleaner is not None:
+                    # Out-of-core results are streamed to a Parquet file next to the source
+                    if st.button("Write Cleaned Data"):
+                        output_name = f"{os.path.splitext(st.session_state.uploaded_file_name)[0]}[cleaned_data].parquet"
+                        try:
+                            output_path = st.session_state.ooc_cleaner.write(os.path.join(ooc_dir, output_name))
+                            alert = f"Cleaned data written to {output_path}!"
+                        except Exception as e:
+                            # e.g. a full disk or a read-only VISWALIS_OOC_DIR
+                            st.error(f"Error: {str(e)}")
+                else:
+                    # Export is only generated on demand and cached per dataset version
+                    download_panel(
+                        df,
+                        st.session_state.df_version,
+                        file_name=f"{st.session_state.uploaded_file_name}[cleaned_data]",
+                    )
 
             # Edit Columns Section
             with st.expander("Edit Columns"):
@@ -107,34 +185,15 @@ if st.session_state.df is not None:
                 replace_text = st.text_input("Text to replace in column names:")
                 replacement_text = st.text_input("Replace with:")
                 if st.button("Apply Standardization"):
-                    if standardize_case == "lowercase":
-                        st.session_state.df.columns = (
-                            st.session_state.df.columns
-                            .str.strip()
-                            .str.lower()
-                            .str.replace(replace_text, replacement_text)
-                        )
-                    elif standardize_case == "uppercase":
-                        st.session_state.df.columns = (
-                            st.session_state.df.columns
-                            .str.strip()
-                            .str.upper()
-                            .str.replace(replace_text, replacement_text)
-                        )
-                    elif standardize_case == "sentence case":
-                        st.session_state.df.columns = (
-                            st.session_state.df.columns
-                            .str.strip()
-                            .str.title()
-                            .str.replace(replace_text, replacement_text)
-                        )
+                    df = apply_step(df, "standardize_column_names", case=standardize_case, to_replace=replace_text, replacement=replacement_text)
                     alert = "Column names standardized!"
 
                 # Drop Column
                 st.subheader("Drop Columns", anchor=False)
-                column_to_drop = st.selectbox("Select column to drop:", st.session_state.df.columns)
+                column_to_drop = st.selectbox("Select column to drop:", df.columns)
+                column_stats_caption(sketch, column_to_drop)
                 if st.button("Drop Column"):
-                    st.session_state.df = st.session_state.df.drop(columns=[column_to_drop])
+                    df = apply_step(df, "drop_columns", columns=[column_to_drop])
                     alert = f"Column '{column_to_drop}' dropped!"
 
             # Handle Missing Values Section
@@ -143,33 +202,36 @@ if st.session_state.df is not None:
                 strategy = st.radio("Select strategy to handle missing values:", ["drop", "mean", "median", "mode", "fill"])
                 if strategy == "fill":
                     fill_value = st.text_input("Value to fill missing data with:")
-                    column_to_handle = st.selectbox("Select column to handle:", st.session_state.df.columns)
+                    column_to_handle = st.selectbox("Select column to handle:", df.columns)
+                    column_stats_caption(sketch, column_to_handle)
 
                 if st.button("Apply Missing Value Handling"):
                     if strategy == "drop":
-                        st.session_state.df = cleaner.handle_missing_values(strategy="drop").get_cleaned_data()
+                        df = apply_step(df, "handle_missing_values", strategy="drop")
                     elif strategy == "mean":
-                        st.session_state.df = cleaner.handle_missing_values(strategy="mean").get_cleaned_data()
+                        df = apply_step(df, "handle_missing_values", strategy="mean")
                     elif strategy == "median":
-                        st.session_state.df = cleaner.handle_missing_values(strategy="median").get_cleaned_data()
+                        df = apply_step(df, "handle_missing_values", strategy="median")
                     elif strategy == "mode":
-                        st.session_state.df = cleaner.handle_missing_values(strategy="mode").get_cleaned_data()
+                        df = apply_step(df, "handle_missing_values", strategy="mode")
                     elif strategy == "fill" and fill_value:
-                        st.session_state.df[column_to_handle] = st.session_state.df[column_to_handle].fillna(fill_value)
+                        df = apply_step(df, "handle_missing_values", strategy="fill", fill_value=fill_value, columns=[column_to_handle])
                     alert = f"Missing values handled using strategy '{strategy}'!"
 
             # Drop Duplicates Section
             with st.expander("Drop Duplicates"):
                 if st.button("Drop Duplicate Rows"):
-                    st.session_state.df = cleaner.drop_duplicates().get_cleaned_data()
+                    df = apply_step(df, "drop_duplicates")
                     alert = "Duplicate rows removed!"
 
             # Remove Outliers Section
             with st.expander("Remove Outliers"):
                 st.subheader("Remove Outliers", anchor=False)
-                column_for_outliers = st.selectbox("Select column to check for outliers:", st.session_state.df.select_dtypes(include=[float, int]).columns)
+                column_for_outliers = st.selectbox("Select column to check for outliers:", df.select_dtypes(include=[float, int]).columns)
+                column_stats_caption(sketch, column_for_outliers)
+                outlier_bounds_caption(sketch, column_for_outliers)
                 if st.button("Remove Outliers"):
-                    st.session_state.df = cleaner.remove_outliers(columns=[column_for_outliers]).get_cleaned_data()
+                    df = apply_step(df, "remove_outliers", columns=[column_for_outliers])
                     alert = f"Outliers removed from column '{column_for_outliers}'!"
 
             # Advanced Data Cleaning Section
@@ -178,56 +240,44 @@ if st.session_state.df is not None:
 
                 # Standardize Dates
                 st.subheader("Standardize Dates", anchor=False)
-                date_column = st.selectbox("Select column with dates:", st.session_state.df.columns)
+                date_column = st.selectbox("Select column with dates:", df.columns)
                 desired_date_format = st.text_input("Enter desired date format (e.g., %Y-%m-%d):", "%Y-%m-%d")
                 if st.button("Standardize Dates"):
                     try:
-                        st.session_state.df = (
-                            cleaner.standardize_dates(column=date_column, date_format=desired_date_format)
-                            .get_cleaned_data()
-                        )
+                        df = apply_step(df, "standardize_dates", column=date_column, date_format=desired_date_format)
                         alert = f"Dates in column '{date_column}' standardized to format '{desired_date_format}'!"
                     except Exception as e:
                         alert = f"Error: {str(e)}"
            
                 # Clean Symbols
                 st.subheader("Clean Symbols", anchor=False)
-                symbol_column = st.selectbox("Select column to clean symbols:", st.session_state.df.columns, key="symbol_column")
+                symbol_column = st.selectbox("Select column to clean symbols:", df.columns, key="symbol_column")
                 unwanted_symbols = st.text_input("Enter symbols to remove (e.g., $,%,&):")
                 if st.button("Remove Symbols"):
                     if unwanted_symbols:
-                        st.session_state.df = (
-                            cleaner.clean_symbols(column=symbol_column, symbols=unwanted_symbols)
-                            .get_cleaned_data()
-                        )
+                        df = apply_step(df, "clean_symbols", column=symbol_column, symbols=unwanted_symbols)
                         alert = f"Unwanted symbols removed from column '{symbol_column}'!"
                     else:
                         alert = "Please specify symbols to remove."
                     
                 # Replace Values
                 st.subheader("Replace Values", anchor=False)
-                replace_column = st.selectbox("Select column to replace values:", st.session_state.df.columns, key="replace_column")
+                replace_column = st.selectbox("Select column to replace values:", df.columns, key="replace_column")
                 value_to_replace = st.text_input("Value to replace:", key="value_to_replace")
                 replacement_value = st.text_input("Replace with:", key="replacement_value")
                 if st.button("Replace Values"):
                     if value_to_replace:
-                        st.session_state.df = (
-                            cleaner.replace_values(column=replace_column, to_replace=value_to_replace, replacement=replacement_value)
-                            .get_cleaned_data()
-                        )
+                        df = apply_step(df, "replace_values", column=replace_column, to_replace=value_to_replace, replacement=replacement_value)
                         alert = f"Replaced '{value_to_replace}' with '{replacement_value}' in column '{replace_column}'!"
                     else:
                         alert = "Please specify a value to replace."
 
                 # Convert to Numeric
                 st.subheader("Convert to Numeric", anchor=False)
-                numeric_column = st.selectbox("Select column to convert to numeric:", st.session_state.df.columns, key="numeric_column")
+                numeric_column = st.selectbox("Select column to convert to numeric:", df.columns, key="numeric_column")
                 if st.button("Convert to Numeric"):
                     try:
-                        st.session_state.df = (
-                            cleaner.convert_to_numeric(column=numeric_column)
-                            .get_cleaned_data()
-                        )
+                        df = apply_step(df, "convert_to_numeric", column=numeric_column)
                         alert = f"Column '{numeric_column}' converted to numeric type!"
                     except Exception as e:
                         alert = f"Error: {str(e)}"
@@ -243,11 +293,11 @@ if st.session_state.df is not None:
         st.header("📊 Dashboard", anchor=False)
         st.write("Explore your data through interactive visualizations.")
 
-        df = st.session_state.get('df')  # Set df based on the Session State
+        df = get_df()  # Set df based on the Session State
 
         if df is not None:
-            # Instantiate the Dashboard class
-            dashboard = Dashboard(df)
+            # Instantiate the Dashboard class (figures are cached per dataset version)
+            dashboard = Dashboard(df, st.session_state.df_version, get_sketch())
             
             # Render the dashboard
             dashboard.render()
@@ -259,7 +309,7 @@ if st.session_state.df is not None:
         st.header("📋 Report Generation", anchor=False)
         st.write("Generate detailed profiling reports for your dataset.")
 
-        df = st.session_state.get("df")  # Retrieve the DataFrame from Session State
+        df = get_df()  # Retrieve the DataFrame from Session State
 
         if df is not None:
             report_title = st.text_input("Enter Title of the Report: ")
@@ -271,7 +321,7 @@ if st.session_state.df is not None:
 
                 try:
                     # Generate the HTML file
-                    with st.spinner("Please wait... Generating your Report"):
+                    with st.spinner("Please wait... Generating your Report"), section("report.profile"):
                         profile_html = profile.to_html()
 
                     st.subheader(f"{report_title}", anchor=False)
@@ -297,4 +347,10 @@ if st.session_state.df is not None:
     
     #AI chatbot
     with tab4:
-        chatbot()
\ No newline at end of file
+        chatbot()
+
+# Record this rerun's profile and show it in the debug panel
+profile_record = finish_rerun(get_df())
+if profile_record and debug_expander is not None:
+    with debug_expander:
+        debug_panel(profile_record)
@@ -0,0 +1,274 @@
+"""
+Load test driving the app headlessly with Streamlit's testing API.
+
+Simulates N analyst sessions that upload a file, clean it, explore the
+dashboard and chat, with the Groq client replaced by a local mock of
+configurable latency. Reports p50/p95 rerun latency per action,
+throughput and memory per session, counting separately the sessions that
+still read the shared dataset instead of a DataFrame of their own.
+
+Run from the `app` directory:
+
+    python -m benchmarks.load_test --sessions 10 --rows 10000 --llm-latency 0.5
+    python -m benchmarks.load_test --sessions 25 --rows 100000 --shared-upload --save benchmarks/baselines/load.json
+
+AppTest swaps process-wide runtime state for every run, so the sessions
+take turns (round-robin, one action each) on a single server process
+instead of overlapping. Latencies are per-rerun service times, and the
+throughput is what one script thread sustains with N sessions alive.
+"""
+import argparse
+import io
+import json
+import os
+import statistics
+import sys
+import time
+import uuid
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+
+from benchmarks.run_benchmarks import environment
+from benchmarks.synthetic_data import make_dataset
+from utils.perf_utils import current_rss_mb
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_ROOT = os.path.dirname(APP_DIR)
+DEFAULT_SESSIONS = 10
+DEFAULT_ROWS = 10_000
+DEFAULT_LLM_LATENCY = 0.5
+
+class MockGroqClient:
+    """Local stand-in for the Groq client that answers after a fixed delay."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, messages, model, **kwargs):
+        self.calls += 1
+        time.sleep(self.latency)
+        content = f"Mock answer to: {messages[-1]['content']}"
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+class SimulatedUpload(io.BytesIO):
+    """Stand-in for the files returned by st.file_uploader, which AppTest cannot drive."""
+
+    def __init__(self, name, data):
+        super().__init__(data)
+        self.name = name
+        self.file_id = uuid.uuid4().hex
+
+class SimulatedSession:
+    """One analyst session: an AppTest instance and the files it has uploaded."""
+
+    def __init__(self, index, timeout):
+        from streamlit.testing.v1 import AppTest
+
+        self.index = index
+        self.app = AppTest.from_file(os.path.join(APP_DIR, "app.py"), default_timeout=timeout)
+        self.uploads = []
+
+# Session whose script is running, read by the patched file uploader
+_current = None
+
+def _file_uploader(self, label, *args, **kwargs):
+    """Patched st.file_uploader returning the running session's simulated uploads."""
+    return list(_current.uploads) or None
+
+def _find(elements, label):
+    return next(element for element in elements if element.label == label)
+
+def open_app(session, data, file_name):
+    """First visit, before anything is uploaded."""
+
+def upload(session, data, file_name):
+    session.uploads = [SimulatedUpload(file_name, data)]
+
+def drop_duplicates(session, data, file_name):
+    _find(session.app.button, "Drop Duplicate Rows").click()
+
+def clean_symbols(session, data, file_name):
+    session.app.selectbox(key="symbol_column").set_value("Price")
+    _find(session.app.text_input, "Enter symbols to remove (e.g., $,%,&):").set_value("$,")
+    _find(session.app.button, "Remove Symbols").click()
+
+def convert_to_numeric(session, data, file_name):
+    session.app.selectbox(key="numeric_column").set_value("Price")
+    _find(session.app.button, "Convert to Numeric").click()
+
+def drop_missing(session, data, file_name):
+    _find(session.app.radio, "Select strategy to handle missing values:").set_value("drop")
+    _find(session.app.button, "Apply Missing Value Handling").click()
+
+def configure_gauge(session, data, file_name):
+    session.app.selectbox(key="gauge1_col").set_value("Amount")
+
+def configure_density(session, data, file_name):
+    session.app.selectbox(key="density_x").set_value("Amount")
+    session.app.selectbox(key="density_y").set_value("Price")
+
+def chat(session, data, file_name):
+    session.app.text_input(key="user_input").set_value(f"How should I summarize column Amount? ({uuid.uuid4().hex[:6]})")
+
+# Actions every session goes through, in order
+ACTIONS = [
+    ("open", open_app),
+    ("upload", upload),
+    ("clean.drop_duplicates", drop_duplicates),
+    ("clean.clean_symbols", clean_symbols),
+    ("clean.convert_to_numeric", convert_to_numeric),
+    ("clean.drop_missing", drop_missing),
+    ("dashboard.gauge", configure_gauge),
+    ("dashboard.density", configure_density),
+]
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) if values else None
+
+def run_load_test(sessions, rows, llm_latency, chat_turns=1, shared_upload=False, timeout=120):
+    """
+    Run every action for every session, round-robin, and time each rerun.
+
+    Parameters:
+    sessions (int): Number of simulated sessions.
+    rows (int): Rows in each uploaded file.
+    llm_latency (float): Seconds the mock LLM takes per answer.
+    chat_turns (int): Chat messages sent by each session.
+    shared_upload (bool): Whether every session uploads the same file (shared in the dataset store).
+    timeout (float): Seconds a single rerun may take.
+
+    Returns:
+    dict: Latencies per action, throughput, memory and error counts.
+    """
+    global _current
+
+    import ai
+    from streamlit.delta_generator import DeltaGenerator
+    from utils.dataset_store import get_dataset_store
+
+    ai.client = MockGroqClient(llm_latency)
+    actions = ACTIONS + [(f"chat.{turn + 1}", chat) for turn in range(chat_turns)]
+
+    print(f"Generating {'1 file' if shared_upload else f'{sessions} files'} of {rows:,} rows...", file=sys.stderr)
+    files = [
+        make_dataset(rows, seed=0 if shared_upload else index).to_csv(index=False).encode()
+        for index in range(1 if shared_upload else sessions)
+    ]
+    simulated = [SimulatedSession(index, timeout) for index in range(sessions)]
+
+    latencies = {name: [] for name, _ in actions}
+    errors = {}
+
+    with mock.patch.object(DeltaGenerator, "file_uploader", _file_uploader):
+        # Warm up imports and module-level initialization so the first session is not penalized
+        _current = SimulatedSession(-1, timeout)
+        _current.app.run()
+
+        rss_start = current_rss_mb()
+        start = time.perf_counter()
+        for name, action in actions:
+            for session in simulated:
+                _current = session
+                data = files[0 if shared_upload else session.index]
+                try:
+                    action(session, data, f"session_{session.index}.csv")
+                    run_start = time.perf_counter()
+                    session.app.run()
+                    latencies[name].append(time.perf_counter() - run_start)
+                    if session.app.exception:
+                        errors[name] = errors.get(name, 0) + 1
+                except Exception as e:
+                    print(f"  session {session.index} {name}: {e!r}", file=sys.stderr)
+                    errors[name] = errors.get(name, 0) + 1
+            done = latencies[name]
+            print(f"  {name:<28} p50 {percentile(done, 50) or 0:>8.3f}s  p95 {percentile(done, 95) or 0:>8.3f}s", file=sys.stderr)
+
+    elapsed = time.perf_counter() - start
+    rss_end = current_rss_mb()
+    all_latencies = [seconds for values in latencies.values() for seconds in values]
+    # Sessions that have not changed their data read the shared copy in the dataset store (df is None);
+    # the others hold a DataFrame of their own, measured with its strings (deep=True)
+    loaded = [s for s in simulated if "df" in s.app.session_state]
+    session_mb = [
+        float(s.app.session_state["df"].memory_usage(index=True, deep=True).sum() / (1024 * 1024))
+        for s in loaded if s.app.session_state["df"] is not None
+    ]
+
+    return {
+        "sessions": sessions,
+        "rows": rows,
+        "llm_latency": llm_latency,
+        "shared_upload": shared_upload,
+        "reruns": len(all_latencies),
+        "elapsed_seconds": elapsed,
+        "throughput_reruns_per_second": len(all_latencies) / elapsed if elapsed else None,
+        "latency": {
+            "p50": percentile(all_latencies, 50),
+            "p95": percentile(all_latencies, 95),
+            "max": max(all_latencies) if all_latencies else None,
+        },
+        "actions": {
+            name: {"p50": percentile(values, 50), "p95": percentile(values, 95), "count": len(values)}
+            for name, values in latencies.items()
+        },
+        "memory": {
+            "rss_start_mb": rss_start,
+            "rss_end_mb": rss_end,
+            "rss_per_session_mb": (rss_end - rss_start) / sessions if rss_start is not None and rss_end is not None else None,
+            "session_df_mb": statistics.mean(session_mb) if session_mb else None,
+            "sessions_with_own_df": len(session_mb),
+            "sessions_on_shared_df": len(loaded) - len(session_mb),
+            "dataset_store_mb": get_dataset_store().memory_usage() / (1024 * 1024),
+        },
+        "llm_calls": ai.client.calls,
+        "errors": errors,
+    }
+
+def print_summary(results):
+    """Print the headline numbers of a load test."""
+    latency, memory = results["latency"], results["memory"]
+    print(f"\n{results['sessions']} sessions x {results['rows']:,} rows, mock LLM {results['llm_latency']}s")
+    print(f"Reruns: {results['reruns']} in {results['elapsed_seconds']:.1f}s ({results['throughput_reruns_per_second']:.2f} reruns/s)")
+    print(f"Rerun latency: p50 {latency['p50']:.3f}s, p95 {latency['p95']:.3f}s, max {latency['max']:.3f}s")
+    if memory["rss_per_session_mb"] is not None:
+        print(f"RSS: {memory['rss_start_mb']:,.0f} -> {memory['rss_end_mb']:,.0f} MB ({memory['rss_per_session_mb']:,.1f} MB per session)")
+    if memory["session_df_mb"] is not None:
+        print(f"Session DataFrame: {memory['session_df_mb']:,.1f} MB on average over {memory['sessions_with_own_df']} sessions with their own copy")
+    print(f"Sessions on the shared dataset: {memory['sessions_on_shared_df']}, dataset store: {memory['dataset_store_mb']:,.1f} MB")
+    if results["errors"]:
+        print(f"Errors: {results['errors']}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the app with simulated sessions.")
+    parser.add_argument("--sessions", type=int, default=DEFAULT_SESSIONS, help="Number of simulated sessions.")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="Rows in each uploaded file.")
+    parser.add_argument("--llm-latency", type=float, default=DEFAULT_LLM_LATENCY, help="Seconds the mock LLM takes per answer.")
+    parser.add_argument("--chat-turns", type=int, default=1, help="Chat messages sent by each session.")
+    parser.add_argument("--shared-upload", action="store_true", help="Every session uploads the same file.")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds a single rerun may take.")
+    parser.add_argument("--save", help="Write the results to this JSON file.")
+    args = parser.parse_args(argv)
+
+    # The app loads its static files relative to the repository root
+    os.chdir(REPO_ROOT)
+    if APP_DIR not in sys.path:
+        sys.path.insert(0, APP_DIR)
+    os.environ.setdefault("GROQ_API_KEY", "load-test")  # The real client is replaced by the mock
+
+    results = run_load_test(args.sessions, args.rows, args.llm_latency, args.chat_turns, args.shared_upload, args.timeout)
+    print_summary(results)
+
+    if args.save:
+        path = os.path.join(APP_DIR, args.save) if not os.path.isabs(args.save) else args.save
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as fh:
+            json.dump({"environment": environment(), "results": results}, fh, indent=2)
+        print(f"\nSaved results to {args.save}", file=sys.stderr)
+    return 1 if results["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,238 @@
+"""
+Benchmark suite for the DataCleaner operations, the Dashboard figure
+builders and the export/report paths.
+
+Run from the `app` directory:
+
+    python -m benchmarks.run_benchmarks --rows 10000 100000 --save benchmarks/baselines/baseline.json
+    python -m benchmarks.run_benchmarks --rows 10000 100000 --compare benchmarks/baselines/baseline.json
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from benchmarks.synthetic_data import make_dataset
+from dashboard import Dashboard
+from utils.data_cleaner import DataCleaner
+from utils.export_utils import EXPORT_FORMATS, available_formats, write_export
+from utils.sketches import DatasetSketch
+
+DEFAULT_ROWS = [10_000, 100_000, 1_000_000]
+DEFAULT_THRESHOLD = 0.2
+MIN_SECONDS_DELTA = 0.005  # Timing changes below this are treated as noise
+MIN_MB_DELTA = 1.0  # Memory changes below this are treated as noise
+
+def cleaner_case(method, **kwargs):
+    """Benchmark case running one DataCleaner method on a fresh cleaner."""
+    return lambda df: DataCleaner(df), lambda cleaner: getattr(cleaner, method)(**kwargs)
+
+def dashboard_case(method, *args, **kwargs):
+    """Benchmark case building one Dashboard figure."""
+    return lambda df: Dashboard(df), lambda dashboard: getattr(dashboard, method)(*args, **kwargs)
+
+def export_case(fmt):
+    """Benchmark case exporting the dataset to a temporary file."""
+    path = os.path.join(tempfile.gettempdir(), f"viswalis_bench{EXPORT_FORMATS[fmt]['extension']}")
+    return lambda df: df, lambda df: write_export(df, path, fmt)
+
+def report_case():
+    """Benchmark case generating the ydata-profiling HTML report."""
+    from ydata_profiling import ProfileReport
+
+    def run(df):
+        profile = ProfileReport(df, title="Benchmark", explorative=True, progress_bar=False)
+        profile.config.html.navbar_show = False
+        return profile.to_html()
+    return lambda df: df, run
+
+def build_cases(include_report=False):
+    """
+    Return the benchmark cases, keyed by name.
+
+    Each case is a (setup, run) pair: setup(df) prepares the object under
+    test outside of the timed region and run(obj) is what gets measured.
+    """
+    cases = {
+        "DataCleaner.standardize_columns": cleaner_case("standardize_columns"),
+        "DataCleaner.handle_missing_values[drop]": cleaner_case("handle_missing_values", strategy="drop"),
+        "DataCleaner.handle_missing_values[fill]": cleaner_case("handle_missing_values", strategy="fill", fill_value=0),
+        "DataCleaner.standardize_dates": cleaner_case("standardize_dates", column="Order Date"),
+        "DataCleaner.clean_symbols": cleaner_case("clean_symbols", column="Price", symbols="$,"),
+        "DataCleaner.replace_values": cleaner_case("replace_values", column="Discount", to_replace="%", replacement=""),
+        "DataCleaner.convert_to_numeric": cleaner_case("convert_to_numeric", column="Discount"),
+        "DataCleaner.drop_duplicates": cleaner_case("drop_duplicates"),
+        "DataCleaner.remove_outliers": cleaner_case("remove_outliers", columns=["Amount"]),
+        "Dashboard.create_gauge_chart": dashboard_case("create_gauge_chart", "Amount", metric_type="median"),
+        "Dashboard.create_pie_chart": dashboard_case("create_pie_chart", "Category"),
+        "Dashboard.create_donut_chart": dashboard_case("create_donut_chart", ["Amount", "Quantity"]),
+        "Dashboard.create_area_plot": dashboard_case("create_area_plot", "Quantity", ["Amount"]),
+        "Dashboard.create_radar_chart": dashboard_case("create_radar_chart", ["Amount", "Quantity", "Rating"]),
+        "Dashboard.create_density_heatmap": dashboard_case("create_density_heatmap", "Amount", "Quantity"),
+        "Dashboard.create_correlation_matrix": dashboard_case("create_correlation_matrix", ["Amount", "Quantity", "Rating"]),
+    }
+    cases["DatasetSketch.from_frame"] = (lambda df: df, DatasetSketch.from_frame)
+    for fmt in available_formats():
+        cases[f"export[{fmt}]"] = export_case(fmt)
+    if include_report:
+        cases["report.to_html"] = report_case()
+    return cases
+
+def measure(setup, run, df, repeat):
+    """
+    Time a benchmark case and record its peak traced memory.
+
+    The timing runs and the memory run are separate, since tracemalloc
+    slows down allocation-heavy code. tracemalloc does not see Arrow's C++
+    allocations, so the memory run also goes through a proxy Arrow memory
+    pool that records their peak separately.
+
+    Returns:
+    dict: Median and minimum seconds over `repeat` runs, peak traced memory
+    in MB and peak Arrow memory in MB.
+    """
+    timings = []
+    for _ in range(repeat):
+        target = setup(df)
+        start = time.perf_counter()
+        run(target)
+        timings.append(time.perf_counter() - start)
+
+    target = setup(df)
+    default_pool = pa.default_memory_pool()
+    arrow_pool = pa.proxy_memory_pool(default_pool)
+    pa.set_memory_pool(arrow_pool)
+    tracemalloc.start()
+    try:
+        run(target)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        pa.set_memory_pool(default_pool)
+
+    return {
+        "seconds": statistics.median(timings),
+        "min_seconds": min(timings),
+        "peak_mb": peak / (1024 * 1024),
+        "arrow_peak_mb": arrow_pool.max_memory() / (1024 * 1024),
+    }
+
+def run_suite(rows_list, repeat, only=None, include_report=False, report_max_rows=100_000):
+    """
+    Run every benchmark case for every dataset size.
+
+    Returns:
+    dict: Results keyed by "rows=<n>", then by case name.
+    """
+    cases = build_cases(include_report)
+    if only:
+        cases = {name: case for name, case in cases.items() if re.search(only, name)}
+
+    # Warm up imports and lazy initialization so the first case is not penalized
+    warmup = make_dataset(100)
+    for setup, run in cases.values():
+        run(setup(warmup))
+
+    results = {}
+    for rows in rows_list:
+        print(f"\nGenerating {rows:,} rows...", file=sys.stderr)
+        df = make_dataset(rows)
+        size_key = f"rows={rows}"
+        results[size_key] = {}
+        for name, (setup, run) in cases.items():
+            if name == "report.to_html" and rows > report_max_rows:
+                continue
+            result = measure(setup, run, df, repeat)
+            results[size_key][name] = result
+            print(f"  {name:<45} {result['seconds']:>10.4f}s {result['peak_mb']:>10.1f} MB {result['arrow_peak_mb']:>10.1f} MB Arrow", file=sys.stderr)
+    return results
+
+def environment():
+    """Describe the machine and library versions the results were taken on."""
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+    }
+
+def compare(baseline, results, threshold):
+    """
+    Compare results against a baseline.
+
+    Parameters:
+    baseline (dict): Results loaded from a baseline file.
+    results (dict): Results of the current run.
+    threshold (float): Allowed relative slowdown or memory growth (0.2 = 20%).
+
+    Returns:
+    list: (size, case, metric, baseline value, current value) of every regression.
+    """
+    regressions = []
+    for size_key, cases in results.items():
+        for name, current in cases.items():
+            previous = baseline.get(size_key, {}).get(name)
+            if previous is None:
+                continue
+            for metric, min_delta in (("seconds", MIN_SECONDS_DELTA), ("peak_mb", MIN_MB_DELTA), ("arrow_peak_mb", MIN_MB_DELTA)):
+                if metric not in previous:  # Baseline saved before this metric was recorded
+                    continue
+                before, after = previous[metric], current[metric]
+                if before:
+                    change = (after - before) / before
+                else:
+                    # No relative change from 0: any growth past the absolute floor is a regression
+                    change = float("inf") if after > before else 0.0
+                flag = "REGRESSION" if change > threshold and after - before > min_delta else ""
+                print(f"{size_key:<14} {name:<45} {metric:<8} {before:>10.4f} -> {after:>10.4f} ({change:+.1%}) {flag}")
+                if flag:
+                    regressions.append((size_key, name, metric, before, after))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark DataCleaner, Dashboard and report/export paths.")
+    parser.add_argument("--rows", type=int, nargs="+", default=DEFAULT_ROWS, help="Dataset sizes to benchmark (10^4 to 10^7).")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case; the median is recorded.")
+    parser.add_argument("--only", help="Regular expression selecting the cases to run.")
+    parser.add_argument("--report", action="store_true", help="Also benchmark the ydata-profiling report.")
+    parser.add_argument("--report-max-rows", type=int, default=100_000, help="Skip the report above this many rows.")
+    parser.add_argument("--save", help="Write the results to this JSON baseline file.")
+    parser.add_argument("--compare", help="Compare the results against this JSON baseline file.")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Relative change flagged as a regression.")
+    args = parser.parse_args(argv)
+
+    # Match the app, which runs pandas in copy-on-write mode
+    pd.set_option("mode.copy_on_write", True)
+
+    results = run_suite(args.rows, args.repeat, args.only, args.report, args.report_max_rows)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, "w") as fh:
+            json.dump({"environment": environment(), "results": results}, fh, indent=2)
+        print(f"\nSaved baseline to {args.save}", file=sys.stderr)
+
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)["results"]
+        regressions = compare(baseline, results, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0%}.", file=sys.stderr)
+            return 1
+        print(f"\nNo regressions beyond {args.threshold:.0%}.", file=sys.stderr)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+CATEGORIES = ["Electronics", "Groceries", "Clothing", "Toys", "Books", "Garden", "Sports", None]
+DATE_FORMATS = ["%Y-%m-%d", "%m/%d/%Y", "%d %b %Y"]
+
+def make_dataset(rows, duplicate_fraction=0.05, null_fraction=0.05, seed=0):
+    """
+    Generate a messy dataset that exercises every DataCleaner operation.
+
+    The frame mixes dtypes and contains nulls, dirty numeric strings
+    ("$1,234.50", "12%"), dates in several formats, numeric outliers and
+    exact duplicate rows.
+
+    Parameters:
+    rows (int): Number of rows to generate.
+    duplicate_fraction (float): Share of rows that are copies of other rows.
+    null_fraction (float): Share of nulls in the nullable columns.
+    seed (int): Random seed, so the same size always gives the same data.
+
+    Returns:
+    pd.DataFrame: The synthetic dataset.
+    """
+    rng = np.random.default_rng(seed)
+    unique_rows = max(1, rows - int(rows * duplicate_fraction))
+
+    amount = rng.normal(500, 120, unique_rows)
+    outliers = rng.random(unique_rows) < 0.01
+    amount[outliers] *= rng.choice([-5, 10], outliers.sum())
+
+    dates = pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 1500, unique_rows), unit="D")
+    date_format = rng.integers(0, len(DATE_FORMATS), unique_rows)
+    date_text = np.empty(unique_rows, dtype=object)
+    for i, fmt in enumerate(DATE_FORMATS):
+        mask = date_format == i
+        date_text[mask] = dates[mask].strftime(fmt)
+
+    df = pd.DataFrame({
+        " Order ID ": np.arange(unique_rows),
+        "Category": rng.choice(np.array(CATEGORIES, dtype=object), unique_rows),
+        "Quantity": rng.integers(1, 20, unique_rows),
+        "Amount": amount,
+        "Price": pd.Series(rng.uniform(1, 5000, unique_rows)).map("${:,.2f}".format),
+        "Discount": pd.Series(rng.integers(0, 60, unique_rows)).astype(str) + "%",
+        "Rating": rng.integers(1, 6, unique_rows).astype(float),
+        "Order Date": date_text,
+    })
+
+    for column in ["Amount", "Rating", "Price", "Order Date"]:
+        df.loc[rng.random(unique_rows) < null_fraction, column] = None
+
+    if rows > unique_rows:
+        duplicates = df.iloc[rng.integers(0, unique_rows, rows - unique_rows)]
+        df = pd.concat([df, duplicates], ignore_index=True)
+    return df
@@ -1,11 +1,50 @@
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 
+from utils.perf_utils import profiled, section
+
+KENDALL_SAMPLE_ROWS = 5_000  # Kendall's tau has no vectorized path, so it runs on a sample
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _cached_figure(version, chart_type, config, _build):
+    """Build and cache a figure per (dataset version, chart type, config)."""
+    return _build()
+
+def _bin_2d(x, y, bins):
+    """
+    Count the points of two numeric arrays on a bins x bins grid.
+
+    Binning is a single vectorized bincount, so the cost is linear in the
+    number of points and the output size only depends on `bins`.
+
+    Returns:
+    tuple: (counts indexed [y, x], x bin centers, y bin centers).
+    """
+    mask = np.isfinite(x) & np.isfinite(y)
+    x, y = x[mask], y[mask]
+    if len(x) == 0:
+        return np.zeros((bins, bins), dtype=np.int64), np.arange(bins), np.arange(bins)
+
+    x_min, y_min = x.min(), y.min()
+    x_span = (x.max() - x_min) or 1.0
+    y_span = (y.max() - y_min) or 1.0
+
+    xi = np.minimum(((x - x_min) / x_span * bins).astype(np.intp), bins - 1)
+    yi = np.minimum(((y - y_min) / y_span * bins).astype(np.intp), bins - 1)
+    counts = np.bincount(yi * bins + xi, minlength=bins * bins).reshape(bins, bins)
+
+    x_centers = x_min + (np.arange(bins) + 0.5) * x_span / bins
+    y_centers = y_min + (np.arange(bins) + 0.5) * y_span / bins
+    return counts, x_centers, y_centers
+
 # Utility functions can be directly placed here or imported from utils.py
 class Dashboard:
-    def __init__(self, df):
+    def __init__(self, df, version=None, sketch=None):
         self.df = df
+        self.version = version  # Dataset version token, used as the figure cache key
+        self.sketch = sketch  # Approximate column statistics (DatasetSketch), if available
         self.numeric_cols = df.select_dtypes(include=['float64', 'int64']).columns
 
     def create_pie_chart(self, column):
@@ -33,7 +72,7 @@ class Dashboard:
                 title=f"Summary of {selected_column}"
             )
 
-            st.plotly_chart(fallback_chart, use_container_width=True)
+            return fallback_chart
 
         # If more than one column is selected
         elif len(columns) > 1:
@@ -52,7 +91,7 @@ class Dashboard:
                 title=f"Average of {', '.join(columns)}"
             )
 
-            return st.plotly_chart(donut_chart, use_container_width=True)
+            return donut_chart
     
 
     def create_area_plot(self, x_column, y_columns):
@@ -85,24 +124,93 @@ class Dashboard:
         return fig
         
 
+    def create_density_heatmap(self, x_column, y_column, bins=100, log_scale=True):
+        """
+        Create a binned density heatmap of two numeric columns.
+
+        The points are counted on the server, so only the bins x bins grid is
+        sent to the browser whatever the number of rows.
+        """
+        counts, x_centers, y_centers = _bin_2d(
+            self.df[x_column].to_numpy(dtype=float, na_value=np.nan),
+            self.df[y_column].to_numpy(dtype=float, na_value=np.nan),
+            bins,
+        )
+        # Leave empty bins blank; the log scale keeps sparse regions visible
+        z = np.where(counts > 0, counts, np.nan)
+        if log_scale:
+            z = np.log10(z)
+
+        fig = go.Figure(go.Heatmap(
+            x=x_centers,
+            y=y_centers,
+            z=z,
+            customdata=counts,
+            colorscale="Oranges",
+            colorbar=dict(title="log10(count)" if log_scale else "count"),
+            hovertemplate=f"{x_column}: %{{x:.3g}}<br>{y_column}: %{{y:.3g}}<br>count: %{{customdata}}<extra></extra>",
+        ))
+        fig.update_layout(
+            title=f"Density of {y_column} vs {x_column}",
+            xaxis_title=x_column,
+            yaxis_title=y_column,
+        )
+        return fig
+
+    def create_correlation_matrix(self, columns, method="pearson"):
+        """
+        Create a heatmap of the pairwise correlations between numeric columns.
+
+        Kendall's tau is computed on a random sample of at most
+        KENDALL_SAMPLE_ROWS rows, since pandas computes it pair by pair
+        without vectorization.
+        """
+        data = self.df[columns]
+        title = f"{method.capitalize()} Correlation Matrix"
+        if method == "kendall" and len(data) > KENDALL_SAMPLE_ROWS:
+            data = data.sample(n=KENDALL_SAMPLE_ROWS, random_state=0)
+            title += f" (sample of {KENDALL_SAMPLE_ROWS:,} rows)"
+        corr = data.corr(method=method)
+
+        fig = go.Figure(go.Heatmap(
+            x=corr.columns,
+            y=corr.index,
+            z=corr.to_numpy(),
+            zmin=-1,
+            zmax=1,
+            colorscale="RdBu",
+            texttemplate="%{z:.2f}",
+        ))
+        fig.update_layout(
+            title=title,
+            yaxis=dict(autorange="reversed"),
+        )
+        return fig
+
     def create_gauge_chart(self, column, metric_type="mean", bar_color="orange", width=100, height=200):
         """Create a Gauge Chart for a specific column and metric type."""
+        # Mean, median and max come from the column sketch when there is one
+        sketch = self.sketch[column] if self.sketch is not None and column in self.sketch else None
+        if sketch is not None and not sketch.numeric:
+            sketch = None
+
         if metric_type == "mean":
-            value = self.df[column].mean()
+            value = sketch.mean if sketch is not None else self.df[column].mean()
             title = f"Mean of {column}"
         elif metric_type == "median":
-            value = self.df[column].median()
-            title = f"Median of {column}"
+            value = sketch.quantile(0.5) if sketch is not None else self.df[column].median()
+            title = f"≈ Median of {column}" if sketch is not None else f"Median of {column}"
         elif metric_type == "mode":
             value = self.df[column].mode().iloc[0] if not self.df[column].mode().empty else 0
             title = f"Mode of {column}"
+        max_value = sketch.max if sketch is not None else self.df[column].max()
 
         fig = go.Figure(go.Indicator(
             mode="gauge+number",
             value=value,
             title={'text': title},
             gauge={
-                'axis': {'range': [0, self.df[column].max()]},
+                'axis': {'range': [0, max_value]},
                 'bar': {'color': f"{bar_color}"},
             }
         ))
@@ -115,6 +223,139 @@ class Dashboard:
 
         return fig
 
+    def cached_figure(self, chart_type, config, build):
+        """
+        Return a figure from the figure cache, building it only on a miss.
+
+        Figures are keyed by (dataset version, chart type, config), so an
+        untouched panel reuses its figure on every rerun.
+        """
+        def timed_build():
+            with section(f"figure.{chart_type}"):
+                return build()
+
+        if self.version is None:
+            return timed_build()
+        return _cached_figure(self.version, chart_type, config, timed_build)
+
+    @st.fragment
+    def render_gauge(self, index, default_metric):
+        """Render one gauge panel. Only this panel reruns when its configuration changes."""
+        # Gauge configuration with metric selection
+        with st.popover("Configure Chart"):
+            gauge_col = st.selectbox("Select a column for Gauge Chart (numeric only):", self.numeric_cols, key=f"gauge{index}_col")
+            gauge_metric = st.radio("Select Metric Type:", ("mean", "median", "mode"), index=default_metric, horizontal=True, key=f"gauge{index}_metric")
+
+            # Set color based on metric type
+            metric_color = {"mean": "red", "median": "blue", "mode": "green"}[gauge_metric]
+
+        if gauge_col:
+            fig = self.cached_figure(
+                "gauge", (gauge_col, gauge_metric, metric_color),
+                lambda: self.create_gauge_chart(gauge_col, metric_type=gauge_metric, bar_color=metric_color)
+            )
+            try:
+                st.plotly_chart(fig, use_container_width=True, key=f"gauge{index}_chart")
+            except:
+                st.error("Duplicate Chart!")
+
+    @st.fragment
+    def render_pie(self):
+        """Render the pie chart panel."""
+        # Pie Chart
+        st.subheader("🎯 Pie Chart", anchor=False)
+        st.caption("Show distribution of categorical data using an intuitive pie chart.")
+        with st.popover("Configure Chart"):
+            column_for_pie = st.selectbox("Select a column for the Pie Chart:", self.df.columns, key="pie_col")
+        if column_for_pie:
+            pie_chart = self.cached_figure("pie", (column_for_pie,), lambda: self.create_pie_chart(column_for_pie))
+            st.plotly_chart(pie_chart, use_container_width=True)
+
+    @st.fragment
+    def render_donut(self):
+        """Render the donut chart panel."""
+        # Donut Chart
+        st.subheader("🎯 Donut Chart", anchor=False)
+        st.caption("Display averages or distributions for numeric columns in a donut-style visualization.")
+
+        with st.popover("Configure Chart"):
+            # Multi-select for numeric columns to include in the donut chart
+            columns_for_donut = st.multiselect(
+                "Select columns for Donut Chart (e.g., grades):", self.numeric_cols, key="donut_cols"
+            )
+
+        if columns_for_donut:
+            donut_chart = self.cached_figure("donut", tuple(columns_for_donut), lambda: self.create_donut_chart(columns_for_donut))
+            st.plotly_chart(donut_chart, use_container_width=True)
+
+    @st.fragment
+    def render_area(self):
+        """Render the area plot panel."""
+        # Area Plot
+        st.subheader("📈 Area Plot", anchor=False)
+        st.caption("Analyze trends over time or across categories using an area plot.")
+        with st.popover("Configure Chart"):
+            area_x = st.selectbox("Select X-axis for Area Plot:", self.numeric_cols, key="area_x")
+            area_y = st.multiselect("Select Y-axis for Area Plot:", self.numeric_cols, key="area_y")
+        if area_x and area_y:
+            area_plot = self.cached_figure("area", (area_x, tuple(area_y)), lambda: self.create_area_plot(area_x, area_y))
+            st.plotly_chart(area_plot, use_container_width=True)
+
+    @st.fragment
+    def render_radar(self):
+        """Render the radar chart panel."""
+        # Radar Chart
+        st.subheader("🧭 Radar Chart", anchor=False)
+        st.caption("Compare multiple metrics on a radar chart for better insights.")
+        with st.popover("Configure Chart"):
+            radar_cols = st.multiselect("Select columns for Radar Chart (numeric only):", self.numeric_cols, key="radar_cols")
+        if radar_cols:
+            radar_chart = self.cached_figure("radar", tuple(radar_cols), lambda: self.create_radar_chart(radar_cols))
+            st.plotly_chart(radar_chart, use_container_width=True)
+
+    @st.fragment
+    def render_density(self):
+        """Render the density heatmap panel."""
+        # Density Heatmap
+        st.subheader("🔥 Density Heatmap", anchor=False)
+        st.caption("Explore how two numeric columns relate, binned on the server so any number of rows renders quickly.")
+        with st.popover("Configure Chart"):
+            density_x = st.selectbox("Select X-axis for Density Heatmap:", self.numeric_cols, key="density_x")
+            density_y = st.selectbox(
+                "Select Y-axis for Density Heatmap:", self.numeric_cols,
+                index=min(1, len(self.numeric_cols) - 1), key="density_y"
+            )
+            density_bins = st.slider("Number of bins:", min_value=10, max_value=300, value=100, step=10, key="density_bins")
+            density_log = st.toggle("Log color scale", value=True, key="density_log")
+        if density_x and density_y:
+            density_chart = self.cached_figure(
+                "density", (density_x, density_y, density_bins, density_log),
+                lambda: self.create_density_heatmap(density_x, density_y, bins=density_bins, log_scale=density_log)
+            )
+            st.plotly_chart(density_chart, use_container_width=True)
+
+    @st.fragment
+    def render_correlation(self):
+        """Render the correlation matrix panel."""
+        # Correlation Matrix
+        st.subheader("🧮 Correlation Matrix", anchor=False)
+        st.caption("Compare the pairwise correlations of numeric columns at a glance.")
+        with st.popover("Configure Chart"):
+            corr_cols = st.multiselect(
+                "Select columns for Correlation Matrix (numeric only):", self.numeric_cols,
+                default=list(self.numeric_cols[:10]), key="corr_cols"
+            )
+            corr_method = st.radio("Select Method:", ("pearson", "spearman", "kendall"), horizontal=True, key="corr_method")
+            if corr_method == "kendall" and len(self.df) > KENDALL_SAMPLE_ROWS:
+                st.caption(f"Kendall is computed on a random sample of {KENDALL_SAMPLE_ROWS:,} of {len(self.df):,} rows.")
+        if len(corr_cols) > 1:
+            corr_chart = self.cached_figure(
+                "correlation", (tuple(corr_cols), corr_method),
+                lambda: self.create_correlation_matrix(corr_cols, method=corr_method)
+            )
+            st.plotly_chart(corr_chart, use_container_width=True)
+
+    @profiled("dashboard.render")
     def render(self):
         """Render the entire dashboard."""
         # Overall Visualizations
@@ -125,80 +366,22 @@ class Dashboard:
         gauge1, gauge2, gauge3 = st.columns(3)
 
         with gauge1:
-            # Gauge configuration with metric selection
-            with st.popover("Configure Chart"):
-                gauge1_col = st.selectbox("Select a column for Gauge Chart (numeric only):", self.numeric_cols, key="gauge1_col")
-                gauge1_metric = st.radio("Select Metric Type:", ("mean", "median", "mode"), index=0, horizontal=True)
-
-                # Set color based on metric type
-                metric_color = {"mean": "red", "median": "blue", "mode": "green"}[gauge1_metric]
-
-            if gauge1_col:
-                fig = self.create_gauge_chart(gauge1_col, metric_type=gauge1_metric, bar_color=metric_color)
-                try:
-                    st.plotly_chart(fig, use_container_width=True)
-                except:
-                    st.error("Duplicate Chart!")
-                
+            self.render_gauge(1, default_metric=0)
 
         with gauge2:
-            # Gauge configuration with metric selection
-            with st.popover("Configure Chart"):
-                gauge2_col = st.selectbox("Select a column for Gauge Chart (numeric only):", self.numeric_cols, key="gauge2_col")
-                gauge2_metric = st.radio("Select Metric Type:", ("mean", "median", "mode"), index=1, horizontal=True)
-
-                # Set color based on metric type
-                metric_color = {"mean": "red", "median": "blue", "mode": "green"}[gauge2_metric]
-
-            if gauge2_col:
-                fig = self.create_gauge_chart(gauge2_col, metric_type=gauge2_metric, bar_color=metric_color)
-                try:
-                    st.plotly_chart(fig, use_container_width=True)
-                except:
-                    st.error("Duplicate Chart!")
+            self.render_gauge(2, default_metric=1)
 
         with gauge3:
-            # Gauge configuration with metric selection
-            with st.popover("Configure Chart"):
-                gauge3_col = st.selectbox("Select a column for Gauge Chart (numeric only):", self.numeric_cols, key="gauge3_col")
-                gauge3_metric = st.radio("Select Metric Type:", ("mean", "median", "mode"), index=2, horizontal=True)
-
-                # Set color based on metric type
-                metric_color = {"mean": "red", "median": "blue", "mode": "green"}[gauge3_metric]
-
-            if gauge3_col:
-                fig = self.create_gauge_chart(gauge3_col, metric_type=gauge3_metric, bar_color=metric_color)
-                try:
-                    st.plotly_chart(fig, use_container_width=True)
-                except:
-                    st.error("Duplicate Chart!")
+            self.render_gauge(3, default_metric=2)
 
         st.markdown("---")
         col1, col2 = st.columns(2)
 
         with col1:
-            # Pie Chart
-            st.subheader("🎯 Pie Chart", anchor=False)
-            st.caption("Show distribution of categorical data using an intuitive pie chart.")
-            with st.popover("Configure Chart"):
-                column_for_pie = st.selectbox("Select a column for the Pie Chart:", self.df.columns)
-            if column_for_pie:
-                pie_chart = self.create_pie_chart(column_for_pie)
-                st.plotly_chart(pie_chart, use_container_width=True)
+            self.render_pie()
 
         with col2:
-            # Donut Chart
-            st.subheader("🎯 Donut Chart", anchor=False)
-            st.caption("Display averages or distributions for numeric columns in a donut-style visualization.")
-            numeric_cols_for_donut = [col for col in self.df.columns if self.df[col].dtype in ['float64', 'int64']]
-
-            with st.popover("Configure Chart"):
-                # Multi-select for numeric columns to include in the donut chart
-                columns_for_donut = st.multiselect(
-                    "Select columns for Donut Chart (e.g., grades):", numeric_cols_for_donut
-                )
-
-            self.create_donut_chart(columns_for_donut)
+            self.render_donut()
 
         st.markdown("---")  
 
@@ -207,22 +390,19 @@ class Dashboard:
         col3, col4 = st.columns(2)
 
         with col3:
-            # Area Plot
-            st.subheader("📈 Area Plot", anchor=False)
-            st.caption("Analyze trends over time or across categories using an area plot.")
-            with st.popover("Configure Chart"):
-                area_x = st.selectbox("Select X-axis for Area Plot:", self.numeric_cols, key="area_x")
-                area_y = st.multiselect("Select Y-axis for Area Plot:", self.numeric_cols, key="area_y")
-            if area_x and area_y:
-                area_plot = self.create_area_plot(area_x, area_y)
-                st.plotly_chart(area_plot, use_container_width=True)
+            self.render_area()
 
         with col4:
-            # Radar Chart
-            st.subheader("🧭 Radar Chart", anchor=False)
-            st.caption("Compare multiple metrics on a radar chart for better insights.")
-            with st.popover("Configure Chart"):
-                radar_cols = st.multiselect("Select columns for Radar Chart (numeric only):", self.numeric_cols, key="radar_cols")
-            if radar_cols:
-                radar_chart = self.create_radar_chart(radar_cols)
-                st.plotly_chart(radar_chart, use_container_width=True)
\ No newline at end of file
+            self.render_radar()
+
+        st.markdown("---")
+
+        # Relationships
+        st.subheader("Relationships", anchor=False)
+        col5, col6 = st.columns(2)
+
+        with col5:
+            self.render_density()
+
+        with col6:
+            self.render_correlation()
@@ -0,0 +1,128 @@
+"""
+Parity tests of ChunkedDataCleaner against DataCleaner.
+
+The CSV files are read in chunks of two rows, so that column types drift
+between chunks: a text column that is empty in the first chunk, a column
+of numbers that turns into text, integers interrupted by a missing value.
+"""
+import gc
+import os
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.chunked_cleaner import ChunkedDataCleaner
+from utils.data_cleaner import DataCleaner
+
+DRIFT_CSV = """name,code,count,flag,empty
+,1,1,True,
+,2,,False,
+x,3,3,,
+y,z,4,,
+1,5,5,True,
+x,3,3,,
+"""
+
+def _assert_same_data(chunked, cleaner):
+    """
+    Compare the cleaned data of both cleaners.
+
+    Missing values are compared as NaN, and dtypes are not compared: a text or
+    boolean column that had missing values comes back from Arrow as bool once
+    they are dropped, where pandas keeps it as object.
+    """
+    pd.testing.assert_frame_equal(
+        _normalize(chunked.get_cleaned_data()), _normalize(cleaner.get_cleaned_data()), check_dtype=False
+    )
+
+def _normalize(df):
+    """Reset the index and use NaN for every missing value, as an in-memory read does."""
+    df = df.reset_index(drop=True)
+    objects = df.select_dtypes(include="object").columns
+    return df.assign(**{column: df[column].astype(object).where(df[column].notna(), np.nan) for column in objects})
+
+@pytest.fixture
+def drift_csv(tmp_path):
+    path = tmp_path / "drift.csv"
+    path.write_text(DRIFT_CSV)
+    return str(path)
+
+def _both(path, tmp_path):
+    chunked = ChunkedDataCleaner(path, work_dir=str(tmp_path / "work"), chunk_rows=2)
+    return chunked, DataCleaner(pd.read_csv(path))
+
+def test_csv_with_type_drift_reads_like_pandas(drift_csv, tmp_path):
+    chunked, cleaner = _both(drift_csv, tmp_path)
+    _assert_same_data(chunked, cleaner)
+
+@pytest.mark.parametrize("steps", [
+    [("convert_to_numeric", {"column": "code"})],
+    [("convert_to_numeric", {"column": "code"}), ("handle_missing_values", {"strategy": "drop"})],
+    [("drop_duplicates", {})],
+    [("drop_columns", {"columns": ["name", "code", "flag", "empty"]}), ("handle_missing_values", {"strategy": "median"})],
+    [("convert_to_numeric", {"column": "code"}), ("remove_outliers", {"columns": ["code", "count"]})],
+])
+def test_steps_match_data_cleaner(drift_csv, tmp_path, steps):
+    chunked, cleaner = _both(drift_csv, tmp_path)
+    chunked.apply_steps(steps)
+    cleaner.apply_steps(steps)
+    _assert_same_data(chunked, cleaner)
+
+def test_outliers_and_median_match_data_cleaner_on_skewed_data(tmp_path):
+    # Heavy tail plus ties: the quartiles are found by narrowing histograms over several passes
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "amount": np.round(rng.lognormal(sigma=2, size=5_000), 1),
+        "quantity": rng.integers(1, 5, size=5_000).astype(float),
+    })
+    df.loc[rng.choice(len(df), 500, replace=False), "amount"] = np.nan
+    path = tmp_path / "skewed.parquet"
+    df.to_parquet(path)
+    chunked = ChunkedDataCleaner(str(path), work_dir=str(tmp_path / "work"), chunk_rows=100)
+    cleaner = DataCleaner(df)
+    steps = [("handle_missing_values", {"strategy": "median"}), ("remove_outliers", {})]
+    chunked.apply_steps(steps)
+    cleaner.apply_steps(steps)
+    _assert_same_data(chunked, cleaner)
+    assert chunked.get_logs() == cleaner.get_logs()
+
+def test_failed_write_leaves_no_partial_file(drift_csv, tmp_path):
+    chunked = ChunkedDataCleaner(drift_csv, work_dir=str(tmp_path / "work"), chunk_rows=2)
+    output = tmp_path / "out"
+    output.mkdir()
+    with mock.patch("pyarrow.parquet.ParquetWriter.write_batch", side_effect=OSError("No space left on device")):
+        with pytest.raises(OSError):
+            chunked.write(str(output / "cleaned.parquet"))
+    assert os.listdir(output) == []
+
+    chunked.write(str(output / "cleaned.parquet"))
+    assert os.listdir(output) == ["cleaned.parquet"]
+    _assert_same_data(ChunkedDataCleaner(str(output / "cleaned.parquet")), DataCleaner(pd.read_csv(drift_csv)))
+
+def test_work_dir_is_removed_with_the_cleaner(drift_csv):
+    chunked = ChunkedDataCleaner(drift_csv, chunk_rows=2)
+    work_dir = chunked.work_dir
+    assert os.path.isdir(work_dir)
+    del chunked
+    gc.collect()
+    assert not os.path.exists(work_dir)
+
+def test_mode_fill_matches_data_cleaner_on_high_cardinality_data(tmp_path):
+    # Counts of a value are split across chunks and buckets; ties resolve to the smallest value
+    rng = np.random.default_rng(1)
+    df = pd.DataFrame({
+        "id": rng.integers(0, 3_000, size=4_000).astype(float),
+        "code": rng.choice([f"c{i}" for i in range(500)], size=4_000),
+        "tie": np.tile([2.0, 1.0, 3.0, 1.0, 2.0], 800),
+    })
+    for column in df.columns:
+        df.loc[rng.choice(len(df), 300, replace=False), column] = np.nan
+    path = tmp_path / "modes.parquet"
+    df.to_parquet(path)
+    chunked = ChunkedDataCleaner(str(path), work_dir=str(tmp_path / "work"), chunk_rows=250)
+    cleaner = DataCleaner(df)
+    chunked.handle_missing_values(strategy="mode")
+    cleaner.handle_missing_values(strategy="mode")
+    _assert_same_data(chunked, cleaner)
@@ -0,0 +1,82 @@
+"""
+Tests of the shared dataset store: spilling to disk, loading back and cleaning up spill files.
+"""
+import os
+import threading
+import time
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from utils import dataset_store
+from utils.dataset_store import DatasetStore
+
+def _frame(seed, rows=10_000):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({"x": rng.random(rows), "n": np.arange(rows), "s": rng.integers(0, 50, rows).astype(str)})
+
+def _spill_files(store):
+    return [name for _, _, names in os.walk(store.spill_dir) for name in names]
+
+def test_spilled_dataset_loads_back_and_its_file_is_removed(tmp_path):
+    frames = [_frame(seed) for seed in range(3)]
+    limit = int(frames[0].memory_usage(deep=True).sum() * 1.5)
+    store = DatasetStore(limit, str(tmp_path))
+    for seed, df in enumerate(frames):
+        store.put(str(seed), lambda df=df: df)
+
+    assert store.memory_usage() <= limit
+    assert len(_spill_files(store)) == 2
+    pd.testing.assert_frame_equal(store.get("0"), frames[0])
+    assert "0.arrow" not in _spill_files(store)
+    # The numeric columns of the loaded frame stay memory-mapped, so only the text counts
+    assert store._entries["0"]["nbytes"] < frames[0].memory_usage(deep=True).sum()
+
+def test_failed_spill_keeps_the_dataset_in_memory(tmp_path):
+    store = DatasetStore(1, str(tmp_path))
+    with mock.patch.object(dataset_store, "write_arrow_ipc", side_effect=OSError("disk full")):
+        store.put("a", lambda: _frame(0))
+        store.put("b", lambda: _frame(1))
+    assert store._entries["a"]["df"] is not None and store._entries["a"]["state"] is None
+    assert _spill_files(store) == []
+
+def test_spilling_does_not_block_other_sessions(tmp_path):
+    store = DatasetStore(1, str(tmp_path))
+    store.put("a", lambda: _frame(0))
+    writing, release = threading.Event(), threading.Event()
+    write = dataset_store.write_arrow_ipc
+
+    def slow_write(df, path):
+        writing.set()
+        release.wait(5)
+        write(df, path)
+
+    with mock.patch.object(dataset_store, "write_arrow_ipc", slow_write):
+        upload = threading.Thread(target=store.put, args=("b", lambda: _frame(1)))
+        upload.start()
+        assert writing.wait(5)
+        start = time.perf_counter()
+        assert len(store.get("a")) == 10_000  # Still in memory while it is being written
+        assert "a" in store and store.sketch("a") is None
+        assert time.perf_counter() - start < 1
+        release.set()
+        upload.join(5)
+    assert store._entries["a"]["df"] is None
+    pd.testing.assert_frame_equal(store.get("a"), _frame(0))
+
+def test_datasets_on_disk_are_bounded(tmp_path):
+    store = DatasetStore(1, str(tmp_path), max_spilled=2)
+    for seed in range(5):
+        store.put(str(seed), lambda seed=seed: _frame(seed, rows=100))
+    assert list(store._entries) == ["2", "3", "4"]
+    assert sorted(_spill_files(store)) == ["2.arrow", "3.arrow"]
+
+def test_spill_dirs_of_dead_processes_are_swept(tmp_path):
+    stale = tmp_path / "pid-999999999"
+    stale.mkdir()
+    (stale / "old.arrow").write_bytes(b"")
+    live = tmp_path / f"pid-{os.getppid()}"
+    live.mkdir()
+    DatasetStore(1, str(tmp_path))
+    assert not stale.exists() and live.exists()
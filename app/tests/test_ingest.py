@@ -0,0 +1,36 @@
+"""
+Tests of multi-file ingestion: shards with different dtypes are promoted to a common schema.
+"""
+import io
+
+import pandas as pd
+
+from utils.ingest import SOURCE_COLUMN, load_files
+
+def _parquet(df):
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+def test_nullable_int_parquet_with_plain_csv():
+    nullable = pd.DataFrame({"id": pd.array([1, None, 3], dtype="Int64"), "name": ["a", "b", "c"]})
+    plain = pd.DataFrame({"id": [4, 5], "name": ["d", "e"]})
+    files = [("nullable.parquet", _parquet(nullable)), ("plain.csv", plain.to_csv(index=False).encode())]
+
+    df = load_files(files)
+
+    assert df["id"].dtype == "Int64"
+    assert df["id"].tolist() == [1, pd.NA, 3, 4, 5]
+    assert df[SOURCE_COLUMN].tolist() == ["nullable.parquet"] * 3 + ["plain.csv"] * 2
+
+def test_nullable_int_with_shard_missing_the_column():
+    nullable = pd.DataFrame({"id": pd.array([1, None], dtype="Int64")})
+    plain = pd.DataFrame({"id": [3], "extra": [1]})
+    other = pd.DataFrame({"extra": [2]})
+    files = [("a.parquet", _parquet(nullable)), ("b.csv", plain.to_csv(index=False).encode()), ("c.csv", other.to_csv(index=False).encode())]
+
+    df = load_files(files)
+
+    assert df["id"].dtype == "Int64"
+    assert df["id"].isna().tolist() == [False, True, False, True]
+    assert df["extra"].dtype == "float64"
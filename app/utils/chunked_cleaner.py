@@ -0,0 +1,701 @@
+import os
+import pickle
+import shutil
+import tempfile
+import uuid
+import weakref
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from utils.data_cleaner import DataCleaner
+from utils.sketches import DatasetSketch
+from utils.temp_utils import process_dir
+
+CHUNK_ROWS = 250_000
+PREVIEW_ROWS = 1_000
+QUANTILE_BINS = 4096
+MAX_BUCKETS = 256
+WORK_DIR = os.path.join(tempfile.gettempdir(), "viswalis_ooc")
+CSV_SUFFIXES = (".csv", ".csv.gz", ".csv.zst")
+
+def open_dataset(path):
+    """
+    Open a Parquet or Arrow IPC file (or a directory of Parquet files) as a dataset.
+
+    Parameters:
+    path (str): Path of the file or directory.
+
+    Returns:
+    pyarrow.dataset.Dataset: The dataset, read lazily.
+    """
+    if os.path.splitext(path)[1].lower() in (".arrow", ".feather", ".ipc"):
+        return ds.dataset(path, format="ipc")
+    return ds.dataset(path, format="parquet")
+
+def _is_numeric_values(values):
+    return pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values)
+
+def _untype_null_columns(table):
+    """Give the columns that are entirely null the null type, which unifies with any other type."""
+    return pa.table(
+        [pa.nulls(len(table)) if column.null_count == len(table) else column for column in table.columns],
+        names=table.column_names,
+    )
+
+def _unify_schemas(schemas):
+    """
+    Unify chunk schemas, turning the columns whose types cannot be unified into text.
+
+    Returns:
+    tuple: The unified schema, and the set of column names turned into text.
+    """
+    try:
+        return pa.unify_schemas(schemas, promote_options="permissive"), set()
+    except (pa.ArrowTypeError, pa.ArrowInvalid):
+        pass
+    text_columns = set()
+    for name in schemas[0].names:
+        try:
+            pa.unify_schemas([pa.schema([schema.field(name)]) for schema in schemas], promote_options="permissive")
+        except (pa.ArrowTypeError, pa.ArrowInvalid):
+            text_columns.add(name)
+    schemas = [
+        pa.schema([field.with_type(pa.string()) if field.name in text_columns else field for field in schema])
+        for schema in schemas
+    ]
+    return pa.unify_schemas(schemas, promote_options="permissive"), text_columns
+
+class ChunkedDataCleaner:
+    """
+    An out-of-core DataCleaner for datasets larger than memory.
+
+    It has the same method API as DataCleaner, but the data lives in an
+    on-disk Parquet dataset. Each operation streams the current dataset in
+    chunks and writes the result as a new dataset in a work directory.
+    Row-local operations delegate each chunk to DataCleaner. Operations
+    that need global statistics (mean/median/mode fill, outlier bounds,
+    duplicates) make a first pass to compute them, then a second pass to
+    apply them.
+    """
+
+    def __init__(self, path, work_dir=None, chunk_rows=CHUNK_ROWS):
+        """
+        Initialize the ChunkedDataCleaner with a dataset on disk.
+
+        Parameters:
+        path (str): CSV (optionally compressed), Parquet or Arrow IPC file, or a directory of Parquet files.
+            CSV input is first converted to Parquet in chunks.
+        work_dir (str): Directory for the intermediate datasets (default: a new temp directory,
+            deleted by close(), when the cleaner is garbage collected, or when the server process exits).
+        chunk_rows (int): Number of rows processed per chunk.
+        """
+        self.work_dir = work_dir or os.path.join(process_dir(WORK_DIR), uuid.uuid4().hex)
+        os.makedirs(self.work_dir, exist_ok=True)
+        # Sessions that end without closing the cleaner release it with their state
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.work_dir, True)
+        self.chunk_rows = chunk_rows
+        self.logs = []
+        self._step = 0
+        self._current_dir = None  # Directory of the current dataset, if written by this cleaner
+        self._sketch = None  # Column sketches of the current dataset, built while it is written
+
+        if path.lower().endswith(CSV_SUFFIXES):
+            self.dataset = None
+            text_columns = self._write(pd.read_csv(path, chunksize=chunk_rows))
+            if text_columns:
+                # Numbers in some chunks and text in others: read those columns as text
+                # throughout, as pandas does when it sees the whole file at once
+                self._write(pd.read_csv(path, chunksize=chunk_rows, dtype={column: str for column in text_columns}))
+        else:
+            self.dataset = open_dataset(path)
+
+    def log_changes(self, action, details):
+        """
+        Log changes made during data cleaning.
+
+        Parameters:
+        action (str): Description of the action performed.
+        details (dict): Additional details about the change (e.g., affected rows or columns).
+        """
+        self.logs.append({"action": action, "details": details})
+
+    @property
+    def columns(self):
+        """list: Column names of the current dataset."""
+        return self.dataset.schema.names
+
+    def num_rows(self):
+        """
+        Count the rows of the current dataset.
+
+        Returns:
+        int: Number of rows.
+        """
+        return self.dataset.count_rows()
+
+    def sketch(self):
+        """
+        Return the column sketches of the current dataset.
+
+        Every step builds the sketch of its output while writing the chunks;
+        a dataset opened from disk is sketched in one streaming pass on first use.
+
+        Returns:
+        DatasetSketch: The sketch.
+        """
+        if self._sketch is None:
+            sketch = DatasetSketch()
+            for chunk in self._chunks():
+                sketch.update(chunk)
+            self._sketch = sketch
+        return self._sketch
+
+    def _chunks(self, columns=None):
+        """Yield the current dataset as pandas chunks (always at least one, possibly empty)."""
+        empty = True
+        for batch in self.dataset.to_batches(columns=columns, batch_size=self.chunk_rows):
+            empty = False
+            yield batch.to_pandas()
+        if empty:
+            schema = self.dataset.schema if columns is None else pa.schema([self.dataset.schema.field(c) for c in columns])
+            yield schema.empty_table().to_pandas()
+
+    def _values(self, column):
+        """Yield the non-null values of a numeric column as float arrays, chunk by chunk."""
+        for chunk in self._chunks(columns=[column]):
+            values = chunk[column].to_numpy(dtype="float64", na_value=np.nan)
+            yield values[~np.isnan(values)]
+
+    def _quantiles(self, column, qs):
+        """
+        Compute exact quantiles of a numeric column without loading it.
+
+        A first pass counts the values and finds their range; the values at
+        the ranks around each quantile are then found by _order_statistics
+        and interpolated linearly, as Series.quantile does.
+
+        Parameters:
+        column (str): Name of the numeric column.
+        qs (list): Quantiles to compute, between 0 and 1.
+
+        Returns:
+        list: The quantiles (NaN if the column has no values).
+        """
+        count, low, high = 0, np.inf, -np.inf
+        for values in self._values(column):
+            if len(values):
+                count += len(values)
+                low, high = min(low, values.min()), max(high, values.max())
+        if count == 0:
+            return [np.nan] * len(qs)
+        positions = [(count - 1) * q for q in qs]
+        ranks = {rank for position in positions for rank in (int(np.floor(position)), min(int(np.floor(position)) + 1, count - 1))}
+        if np.isfinite(high - low):
+            found = self._order_statistics(column, ranks, low, high)
+        else:
+            # Infinite values (or a range overflowing float64) cannot be binned
+            ordered = np.sort(np.concatenate(list(self._values(column))))
+            found = {rank: ordered[rank] for rank in ranks}
+        quantiles = []
+        for position in positions:
+            below, above = found[int(np.floor(position))], found[min(int(np.floor(position)) + 1, count - 1)]
+            quantiles.append(below + (above - below) * (position - np.floor(position)))
+        return quantiles
+
+    def _order_statistics(self, column, ranks, low, high):
+        """
+        Find the values at the given ranks (0-based, in ascending order) of a numeric column.
+
+        Each pass counts the values of the range holding a rank in a
+        histogram and narrows the range to the bin the rank falls in. Once
+        that bin holds at most one chunk of values, the next pass collects
+        them and the rank is read from the sorted bin. Memory stays bounded
+        by the histograms and one chunk, usually in two passes.
+
+        Returns:
+        dict: Value of each rank.
+        """
+        # Half-open value ranges [start, stop) still to search, with the number of values
+        # below them and the ranks they hold; ranks that share a range share its passes
+        pending = {(low, np.nextafter(high, np.inf), 0): set(ranks)}
+        collect, found = {}, {}
+        while pending or collect:
+            edges = {key: np.linspace(key[0], key[1], QUANTILE_BINS + 1) for key in pending}
+            counts = {key: np.zeros(QUANTILE_BINS, dtype=np.int64) for key in pending}
+            parts = {key: [] for key in collect}
+            for values in self._values(column):
+                for start, stop, below in pending:
+                    inside = values[(values >= start) & (values < stop)]
+                    bins = np.clip(np.searchsorted(edges[start, stop, below], inside, side="right") - 1, 0, QUANTILE_BINS - 1)
+                    counts[start, stop, below] += np.bincount(bins, minlength=QUANTILE_BINS)
+                for start, stop, below in collect:
+                    parts[start, stop, below].append(values[(values >= start) & (values < stop)])
+
+            for key, key_ranks in collect.items():
+                ordered = np.sort(np.concatenate(parts[key]))
+                found.update({rank: ordered[rank - key[2]] for rank in key_ranks})
+            collect, narrowed = {}, {}
+            for key, key_ranks in pending.items():
+                cumulative = key[2] + np.cumsum(counts[key])
+                for rank in key_ranks:
+                    b = int(np.searchsorted(cumulative, rank, side="right"))
+                    start, stop = edges[key][b], edges[key][b + 1]
+                    below = int(cumulative[b] - counts[key][b])
+                    if counts[key][b] <= self.chunk_rows:
+                        collect.setdefault((start, stop, below), set()).add(rank)
+                    elif np.nextafter(start, np.inf) >= stop:
+                        found[rank] = start  # A bin this narrow holds a single value
+                    else:
+                        narrowed.setdefault((start, stop, below), set()).add(rank)
+            pending = narrowed
+        return found
+
+    def _write(self, chunks):
+        """
+        Write chunks as the next dataset and make it the current one.
+
+        Every chunk goes to its own Parquet file. Columns that are all null
+        in a chunk are written untyped so they take the type of the other
+        chunks, and the file schemas are unified with numeric promotion
+        (e.g. int64 and double). A column whose types still conflict
+        (e.g. double in one chunk and text in another) is converted to
+        text in the files that hold it with another type.
+
+        Returns:
+        set: Names of the columns converted to text.
+        """
+        self._step += 1
+        out_dir = os.path.join(self.work_dir, f"step_{self._step:03d}")
+        os.makedirs(out_dir)
+
+        files, schemas, original = [], [], None
+        sketch = DatasetSketch()
+        for i, chunk in enumerate(chunks):
+            sketch.update(chunk)
+            table = pa.Table.from_pandas(chunk, preserve_index=False).replace_schema_metadata(None)
+            if original is None:
+                original = table.schema
+            table = _untype_null_columns(table)
+            path = os.path.join(out_dir, f"part-{i:05d}.parquet")
+            pq.write_table(table, path)
+            files.append(path)
+            schemas.append(table.schema)
+
+        schema, text_columns = _unify_schemas(schemas)
+        # Columns null in every chunk keep the type of the first one
+        schema = pa.schema([original.field(field.name) if pa.types.is_null(field.type) else field for field in schema])
+        for path, file_schema in zip(files, schemas):
+            convert = [name for name in text_columns if not file_schema.field(name).type.equals(schema.field(name).type)]
+            if convert:
+                chunk = pq.read_table(path).to_pandas()
+                chunk = chunk.assign(**{name: chunk[name].astype(str).where(chunk[name].notna(), None) for name in convert})
+                pq.write_table(pa.Table.from_pandas(chunk, preserve_index=False).replace_schema_metadata(None), path)
+        previous_dir = self._current_dir
+        self.dataset = ds.dataset(files, schema=schema, format="parquet")
+        self._current_dir = out_dir
+        # The sketch saw the converted columns as numbers in some chunks, so it is rebuilt on demand
+        self._sketch = None if text_columns else sketch
+        if previous_dir is not None:
+            shutil.rmtree(previous_dir, ignore_errors=True)
+        return text_columns
+
+    def _transform(self, func):
+        """Apply a function to every chunk and write the result as the current dataset."""
+        self._write(func(chunk) for chunk in self._chunks())
+
+    def _delegate(self, method, **kwargs):
+        """Run a row-local DataCleaner method on every chunk."""
+        self._transform(lambda chunk: getattr(DataCleaner(chunk), method)(**kwargs).get_cleaned_data())
+
+    def _check_column(self, column):
+        if column not in self.columns:
+            raise ValueError(f"Column '{column}' does not exist.")
+
+    def _is_numeric(self, column):
+        field_type = self.dataset.schema.field(column).type
+        return pa.types.is_integer(field_type) or pa.types.is_floating(field_type)
+
+    def standardize_columns(self):
+        """
+        Standardize column names by stripping spaces, converting to lowercase,
+        and replacing spaces with underscores.
+
+        Returns:
+        self: The ChunkedDataCleaner instance to enable method chaining.
+        """
+        old_columns = self.columns
+        self._delegate("standardize_columns")
+        self.log_changes("Standardized Column Names", {"before": old_columns, "after": self.columns})
+        return self
+
+    def standardize_column_names(self, case="lowercase", to_replace="", replacement=""):
+        """
+        Standardize column names to a case and replace text within them.
+
+        Returns:
+        self: The ChunkedDataCleaner instance to enable method chaining.
+        """
+        old_columns = self.columns
+        self._delegate("standardize_column_names", case=case, to_replace=to_replace, replacement=replacement)
+        self.log_changes("Standardized Column Names", {"before": old_columns, "after": self.columns})
+        return self
+
+    def drop_columns(self, columns):
+        """
+        Drop columns from the dataset.
+
+        Returns:
+        self: The ChunkedDataCleaner instance to enable method chaining.
+        """
+        keep = [column for column in self.columns if column not in set(columns)]
+        self._write(self._chunks(columns=keep))
+        self.log_changes("Dropped Columns", {"columns": list(columns)})
+        return self
+
+    def _null_counts(self):
+        """First pass: count the missing values of every column."""
+        counts = None
+        for chunk in self._chunks():
+            chunk_counts = chunk.isnull().sum()
+            counts = chunk_counts if counts is None else counts.add(chunk_counts, fill_value=0)
+        return counts
+
+    def _fill_values(self, strategy, columns):
+        """First pass(es): compute the global mean, median or mode of each column, one column at a time."""
+        values = {}
+        if strategy == "mean":
+            numeric = [c for c in columns if self._is_numeric(c)]
+            sums = pd.Series(0.0, index=numeric)
+            counts = pd.Series(0, index=numeric)
+            for chunk in self._chunks(columns=numeric):
+                sums += chunk.sum()
+                counts += chunk.count()
+            values = (sums / counts.replace(0, np.nan)).dropna().to_dict()
+        elif strategy == "median":
+            for column in columns:
+                if self._is_numeric(column):
+                    values[column] = self._quantiles(column, [0.5])[0]
+        elif strategy == "mode":
+            for column in columns:
+                modes = self._modes(column)
+                if modes:
+                    values[column] = modes[0]
+        return pd.Series(values, dtype=object)
+
+    def _num_buckets(self):
+        """Number of on-disk hash buckets for a pass over the dataset, about one chunk of rows each."""
+        return int(min(MAX_BUCKETS, max(1, -(-self.num_rows() // self.chunk_rows))))
+
+    def _modes(self, column):
+        """
+        Find the most frequent values of a column, in sorted order as DataFrame.mode() returns them.
+
+        The value counts of each chunk are partitioned by the hash of the
+        value into on-disk buckets, so that all the counts of a value land in
+        the same bucket. Each bucket is then summed on its own and only its
+        most frequent values are kept, so memory holds one bucket instead of
+        the counts of every distinct value.
+        """
+        num_buckets = self._num_buckets()
+        bucket_dir = os.path.join(self.work_dir, f"mode_{self._step:03d}")
+        os.makedirs(bucket_dir, exist_ok=True)
+        paths = [os.path.join(bucket_dir, f"bucket-{k:03d}.pkl") for k in range(num_buckets)]
+        best, modes = 0, []
+        try:
+            files = [open(path, "wb") for path in paths]
+            try:
+                for chunk in self._chunks(columns=[column]):
+                    counts = chunk[column].value_counts()
+                    counts = counts[counts > 0]  # Unused categories
+                    if counts.empty:
+                        continue
+                    keys = pd.Series(counts.index)
+                    if _is_numeric_values(keys):
+                        keys = keys.astype("float64")  # 3 and 3.0 from chunks with and without nulls
+                    buckets = (pd.util.hash_pandas_object(keys, index=False).to_numpy() % num_buckets).astype(np.int64)
+                    for k in np.unique(buckets):
+                        pickle.dump(counts[buckets == k], files[k])
+            finally:
+                for fh in files:
+                    fh.close()
+
+            for path in paths:
+                parts = []
+                with open(path, "rb") as fh:
+                    while True:
+                        try:
+                            parts.append(pickle.load(fh))
+                        except EOFError:
+                            break
+                if not parts:
+                    continue
+                counts = pd.concat(parts).groupby(level=0, sort=False).sum()
+                top = counts.max()
+                if top >= best:
+                    modes = (modes if top == best else []) + counts.index[counts == top].tolist()
+                    best = top
+        finally:
+            shutil.rmtree(bucket_dir, ignore_errors=True)
+        try:
+            return sorted(modes)
+        except TypeError:
+            return modes
+
+    def handle_missing_values(self, strategy="drop", fill_value=None, columns=None):
+        """
+        Handle missing values in the dataset.
+
+        Parameters:
+        strategy (str): Strategy for handling missing values.
+        fill_value: Value to fill when strategy is 'fill'.
+        columns (list): Columns to fill when strategy is 'fill' (default: all columns with missing values).
+
+        Returns:
+        self: The ChunkedDataCleaner instance to enable method chaining.
+        """
+        if strategy == "drop":
+            rows_before = self.num_rows()
+            self._delegate("handle_missing_values", strategy="drop")
+            self.log_changes("Dropped Missing Values", {"affected_rows": rows_before - self.num_rows()})
+        elif strategy in ["mean", "median", "mode"]:
+            null_counts = self._null_counts()
+            missing_cols = null_counts[null_counts > 0].index.tolist()
+            fill_values = self._fill_values(strategy, missing_cols)
+            if not fill_values.empty:
+                self._delegate("handle_missing_values", strategy="fill", fill_value=fill_values, columns=fill_values.index.tolist())
+            self.log_changes(f"Filled Missing Values with {strategy.capitalize()}", {"columns": fill_values.index.tolist()})
+        elif strategy == "fill" and fill_value is not None:
+            self._delegate("handle_missing_values", strategy="fill", fill_value=fill_value, columns=columns)
+            self.log_changes("Filled Missing Values with Custom Value", {"value": fill_value})
+        else:
+            raise ValueError("Invalid strategy for handling missing values.")
+        return self
+
+    def standardize_dates(self, column, date_format="%Y-%m-%d"):
+        """
+        Standardize dates in a specified column to a uniform format.
+
+        Dates are parsed chunk by chunk, so a column mixing date formats may
+        be inferred differently in different chunks.
+
+        Returns:
+        self: The ChunkedDataCleaner instance to enable method chaining.
+        """
+        self._check_column(column)
+        self._delegate("standardize_dates", column=column, date_format=date_format)
+        self.log_changes("Standardized Dates", {"column": column})
+        return self
+
+    def clean_symbols(self, column, symbols):
+        """
+        Remove unnecessary symbols from values in a specified column.
+
+        Returns:
+        self: The ChunkedDataCleaner instance to enable method chaining.
+        """
+        self._check_column(column)
+        self._delegate("clean_symbols", column=column, symbols=symbols)
+        self.log_changes("Cleaned Symbols", {"column": column, "symbols": symbols})
+        return self
+
+    def convert_to_numeric(self, column):
+        """
+        Convert string representations of numbers to numeric values.
+
+        Returns:
+        self: The ChunkedDataCleaner instance to enable method chaining.
+        """
+        self._check_column(column)
+        self._delegate("convert_to_numeric", column=column)
+        self.log_changes("Converted to Numeric", {"column": column})
+        return self
+
+    def drop_duplicates(self):
+        """
+        Drop duplicate rows, keeping the first occurrence.
+
+        Rows are compared through 64-bit hashes. A first pass writes the
+        hash and position of every row to on-disk buckets partitioned by
+        hash, so that equal rows land in the same bucket. Each bucket is
+        then deduplicated in memory on its own, and a second pass drops the
+        positions found to repeat an earlier row. Memory holds one bucket
+        and the positions of the duplicates. A hash collision between two
+        different rows is possible but vanishingly unlikely.
+
+        Returns:
+        self: The ChunkedDataCleaner instance to enable method chaining.
+        """
+        bucket_dir = os.path.join(self.work_dir, f"dedupe_{self._step:03d}")
+        os.makedirs(bucket_dir, exist_ok=True)
+        num_buckets = self._num_buckets()
+        record = np.dtype([("hash", np.uint64), ("row", np.int64)])
+        paths = [os.path.join(bucket_dir, f"bucket-{k:03d}.bin") for k in range(num_buckets)]
+        try:
+            # First pass: partition (hash, position) records into buckets by hash
+            files = [open(path, "wb") for path in paths]
+            try:
+                offset = 0
+                for chunk in self._chunks():
+                    records = np.empty(len(chunk), dtype=record)
+                    records["hash"] = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+                    records["row"] = np.arange(offset, offset + len(chunk))
+                    offset += len(chunk)
+                    buckets = (records["hash"] % num_buckets).astype(np.int64)
+                    order = np.argsort(buckets, kind="stable")
+                    ends = np.cumsum(np.bincount(buckets, minlength=num_buckets))
+                    for k, part in enumerate(np.split(records[order], ends[:-1])):
+                        if len(part):
+                            part.tofile(files[k])
+            finally:
+                for fh in files:
+                    fh.close()
+
+            # Within a bucket the records are in row order, so the first of each hash is kept
+            duplicates = []
+            for path in paths:
+                records = np.fromfile(path, dtype=record)
+                _, first = np.unique(records["hash"], return_index=True)
+                repeated = np.ones(len(records), dtype=bool)
+                repeated[first] = False
+                duplicates.append(records["row"][repeated])
+            duplicates = np.sort(np.concatenate(duplicates))
+        finally:
+            shutil.rmtree(bucket_dir, ignore_errors=True)
+
+        # Second pass: drop the duplicate positions
+        offset = 0
+
+        def dedupe(chunk):
+            nonlocal offset
+            lo, hi = np.searchsorted(duplicates, [offset, offset + len(chunk)])
+            keep = np.ones(len(chunk), dtype=bool)
+            keep[duplicates[lo:hi] - offset] = False
+            offset += len(chunk)
+            return chunk[keep]
+
+        self._transform(dedupe)
+        self.log_changes("Dropped Duplicates", {"duplicates_removed": int(len(duplicates))})
+        return self
+
+    def remove_outliers(self, columns=None):
+        """
+        Remove outliers using the IQR method.
+
+        For every column, the exact quartiles are computed in a few streaming
+        passes over that column alone, then a last pass streams the rows
+        outside the bounds out of the dataset.
+
+        Parameters:
+        columns (list): Columns to check for outliers (default: all numeric columns).
+
+        Returns:
+        self: The ChunkedDataCleaner instance to enable method chaining.
+        """
+        if columns is None:
+            columns = [column for column in self.columns if self._is_numeric(column)]
+        outlier_info = {}
+        for col in columns:
+            Q1, Q3 = self._quantiles(col, [0.25, 0.75])
+            IQR = Q3 - Q1
+            lower, upper = Q1 - 1.5 * IQR, Q3 + 1.5 * IQR
+            rows_before = self.num_rows()
+            self._transform(lambda chunk: chunk[~((chunk[col] < lower) | (chunk[col] > upper))])
+            outlier_info[col] = rows_before - self.num_rows()
+        self.log_changes("Removed Outliers", outlier_info)
+        return self
+
+    def normalize_case(self, column, case_type="lowercase"):
+        """
+        Normalize the case of text data in a specified column.
+        """
+        self._check_column(column)
+        self._delegate("normalize_case", column=column, case_type=case_type)
+        return self
+
+    def replace_values(self, column, to_replace, replacement):
+        """
+        Replace specific values in a column.
+        """
+        self._check_column(column)
+        self._delegate("replace_values", column=column, to_replace=to_replace, replacement=replacement)
+        return self
+
+    def apply_steps(self, steps):
+        """
+        Replay recorded cleaning steps on the dataset.
+
+        Parameters:
+        steps (list): (method name, keyword arguments) pairs, in order.
+
+        Returns:
+        self: The ChunkedDataCleaner instance to enable method chaining.
+        """
+        for method, kwargs in steps:
+            getattr(self, method)(**kwargs)
+        return self
+
+    def get_logs(self):
+        """
+        Return a log of changes.
+
+        Returns:
+        list: Logs of changes made during cleaning.
+        """
+        return self.logs
+
+    def preview(self, rows=PREVIEW_ROWS):
+        """
+        Return the first rows of the current dataset.
+
+        Parameters:
+        rows (int): Number of rows to return.
+
+        Returns:
+        pd.DataFrame: The first rows.
+        """
+        return self.dataset.head(rows).to_pandas()
+
+    def get_cleaned_data(self):
+        """
+        Return the whole cleaned dataset as a DataFrame.
+
+        This loads everything in memory; use write() for larger-than-memory data.
+
+        Returns:
+        pd.DataFrame: The cleaned DataFrame.
+        """
+        return self.dataset.to_table().to_pandas()
+
+    def write(self, path):
+        """
+        Stream the cleaned dataset to a single Parquet file.
+
+        The file is written under a temporary name and renamed into place,
+        so a failed write never leaves a partial file at the destination.
+
+        Parameters:
+        path (str): Destination file path.
+
+        Returns:
+        str: The path of the written file.
+        """
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            with pq.ParquetWriter(tmp_path, self.dataset.schema, compression="zstd") as writer:
+                for batch in self.dataset.to_batches(batch_size=self.chunk_rows):
+                    writer.write_batch(batch)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return path
+
+    def close(self):
+        """
+        Delete the intermediate datasets of this cleaner.
+        """
+        self._finalizer()
@@ -13,7 +13,9 @@ class DataCleaner:
         Parameters:
         df (pd.DataFrame): The DataFrame to clean.
         """
-        self.df = df.copy()  # Create a copy to avoid modifying the original DataFrame
+        # Create a copy to avoid modifying the original DataFrame. With copy-on-write
+        # enabled a shallow copy is enough: data is only copied once it is modified.
+        self.df = df.copy(deep=not pd.get_option("mode.copy_on_write"))
         self.logs = []  # Initialize logs for tracking changes
 
     def log_changes(self, action, details):
@@ -47,13 +49,57 @@ class DataCleaner:
         })
         return self
 
-    def handle_missing_values(self, strategy="drop", fill_value=None):
+    def standardize_column_names(self, case="lowercase", to_replace="", replacement=""):
+        """
+        Standardize column names to a case and replace text within them.
+
+        Parameters:
+        case (str): Target case ("lowercase", "uppercase" or "sentence case").
+        to_replace (str): Text to replace in the column names.
+        replacement (str): Text to replace it with.
+
+        Returns:
+        self: The DataCleaner instance to enable method chaining.
+        """
+        old_columns = self.df.columns.tolist()
+        columns = self.df.columns.str.strip()
+        if case == "lowercase":
+            columns = columns.str.lower()
+        elif case == "uppercase":
+            columns = columns.str.upper()
+        elif case == "sentence case":
+            columns = columns.str.title()
+        else:
+            raise ValueError(f"Invalid case '{case}' for column names.")
+        self.df.columns = columns.str.replace(to_replace, replacement, regex=False)
+        self.log_changes("Standardized Column Names", {
+            "before": old_columns,
+            "after": self.df.columns.tolist()
+        })
+        return self
+
+    def drop_columns(self, columns):
+        """
+        Drop columns from the DataFrame.
+
+        Parameters:
+        columns (list): Column names to drop.
+
+        Returns:
+        self: The DataCleaner instance to enable method chaining.
+        """
+        self.df = self.df.drop(columns=columns)
+        self.log_changes("Dropped Columns", {"columns": list(columns)})
+        return self
+
+    def handle_missing_values(self, strategy="drop", fill_value=None, columns=None):
         """
         Handle missing values in the DataFrame.
 
         Parameters:
         strategy (str): Strategy for handling missing values.
         fill_value: Value to fill when strategy is 'fill'.
+        columns (list): Columns to fill when strategy is 'fill' (default: all columns with missing values).
 
         Returns:
         self: The DataCleaner instance to enable method chaining.
@@ -69,6 +115,8 @@ class DataCleaner:
             self.log_changes(f"Filled Missing Values with {strategy.capitalize()}", {"columns": missing_cols.tolist()})
         elif strategy == "fill" and fill_value is not None:
             missing_cols = self.df.columns[self.df.isnull().any()]
+            if columns is not None:
+                missing_cols = missing_cols.intersection(columns)
             self.df[missing_cols] = self.df[missing_cols].fillna(fill_value)
             self.log_changes("Filled Missing Values with Custom Value", {"value": fill_value})
         else:
@@ -190,6 +238,20 @@ class DataCleaner:
         self.df[column] = self.df[column].str.replace(to_replace, replacement, regex=False)
         return self
 
+    def apply_steps(self, steps):
+        """
+        Replay recorded cleaning steps on the DataFrame.
+
+        Parameters:
+        steps (list): (method name, keyword arguments) pairs, in order.
+
+        Returns:
+        self: The DataCleaner instance to enable method chaining.
+        """
+        for method, kwargs in steps:
+            getattr(self, method)(**kwargs)
+        return self
+
     def get_logs(self):
         """
         Return a log of changes.
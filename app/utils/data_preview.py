@@ -0,0 +1,86 @@
+import math
+import streamlit as st
+
+from utils.perf_utils import section
+
+PAGE_SIZES = [50, 100, 250, 500, 1000]
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _row_positions(_df, version, sort_column, ascending, filter_column, filter_text):
+    """
+    Compute the row positions of the preview after filtering and sorting.
+
+    The DataFrame itself is not hashed (leading underscore); the cache is
+    keyed on the dataset version token instead, so repeated page changes
+    on the same dataset state never re-sort or re-filter.
+
+    Returns:
+    np.ndarray: Positional indices of the rows to display, in order.
+    """
+    positions = None
+
+    if filter_column is not None and filter_text:
+        mask = (
+            _df[filter_column]
+            .astype(str)
+            .str.contains(filter_text, case=False, regex=False, na=False)
+        )
+        positions = mask.to_numpy().nonzero()[0]
+
+    if sort_column is not None:
+        column = _df[sort_column].reset_index(drop=True)
+        if positions is not None:
+            column = column.iloc[positions]
+        try:
+            order = column.sort_values(ascending=ascending, kind="stable", na_position="last")
+        except TypeError:
+            # Mixed types in an object column, fall back to sorting the text
+            order = column.astype(str).sort_values(ascending=ascending, kind="stable")
+        positions = order.index.to_numpy()
+
+    return positions
+
+def paginated_preview(df, version, key="preview"):
+    """
+    Display a server-side paginated preview of a DataFrame.
+
+    Only the rows of the current page are sent to the browser. Sorting and
+    filtering run on the server and are cached per dataset version.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame to preview.
+    version (str): Version token of the current dataset state.
+    key (str): Prefix for the widget keys.
+    """
+    with st.popover("Sort & Filter"):
+        sort_column = st.selectbox("Sort by:", df.columns, index=None, key=f"{key}_sort_column")
+        ascending = st.toggle("Ascending", value=True, key=f"{key}_ascending")
+        filter_column = st.selectbox("Filter column:", df.columns, index=None, key=f"{key}_filter_column")
+        filter_text = st.text_input("Contains:", key=f"{key}_filter_text")
+
+    with section("preview.filter_sort"):
+        positions = _row_positions(df, version, sort_column, ascending, filter_column, filter_text)
+    total_rows = len(df) if positions is None else len(positions)
+
+    page_col, size_col = st.columns([0.5, 0.5])
+    with size_col:
+        page_size = st.selectbox("Rows per page:", PAGE_SIZES, index=1, key=f"{key}_page_size")
+    total_pages = max(1, math.ceil(total_rows / page_size))
+    # Keep the current page in range when a filter shrinks the result; the page
+    # is only set through session state, so the widget has no default value
+    st.session_state[f"{key}_page"] = min(st.session_state.get(f"{key}_page", 1), total_pages)
+    with page_col:
+        page = st.number_input("Page:", min_value=1, max_value=total_pages, step=1, key=f"{key}_page")
+
+    start = (page - 1) * page_size
+    stop = min(start + page_size, total_rows)
+
+    # Slice the visible window only
+    if positions is None:
+        window = df.iloc[start:stop]
+    else:
+        window = df.iloc[positions[start:stop]]
+
+    with section("preview.render"):
+        st.dataframe(window, use_container_width=True)
+    st.caption(f"Showing rows {start + 1 if total_rows else 0}–{stop} of {total_rows:,} ({len(df):,} total, {len(df.columns)} columns)")
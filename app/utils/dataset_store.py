@@ -0,0 +1,268 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+import numpy as np
+import pyarrow as pa
+import streamlit as st
+
+from utils.export_utils import write_arrow_ipc
+from utils.temp_utils import process_dir, sweep_stale_dirs
+
+DEFAULT_MEMORY_LIMIT_MB = 2048
+DEFAULT_SPILL_DIR = os.path.join(tempfile.gettempdir(), "viswalis_spill")
+DEFAULT_MAX_SPILLED = 32
+
+def content_hash(data):
+    """
+    Hash the raw bytes of an uploaded file.
+
+    Parameters:
+    data (bytes): The file contents.
+
+    Returns:
+    str: Hex digest identifying the contents.
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def _remove_file(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass  # Already gone, or still mapped on Windows: removed with the process directory
+
+def _read_spilled(path):
+    """
+    Memory-map a spilled dataset back as a DataFrame.
+
+    Numeric columns without nulls stay backed by the mapped file (one block
+    per column, so pandas does not copy them to consolidate blocks); the
+    other columns are copied into memory.
+
+    Returns:
+    tuple: The DataFrame and the bytes it holds in memory, not counting the mapped columns.
+    """
+    source = pa.memory_map(path)
+    table = pa.ipc.open_file(source).read_all()
+    source.seek(0)
+    mapped = source.read_buffer(source.size())
+    df = table.to_pandas(split_blocks=True)
+
+    def is_mapped(values):
+        return isinstance(values, np.ndarray) and mapped.address <= values.ctypes.data < mapped.address + mapped.size
+
+    nbytes = int(df.index.memory_usage(deep=True)) + sum(
+        int(df[column].memory_usage(index=False, deep=True))
+        for column in df.columns if not is_mapped(df[column].values)
+    )
+    return df, nbytes
+
+class DatasetStore:
+    """
+    A process-wide store of read-only base DataFrames shared by all sessions.
+
+    Datasets are keyed by the content hash of the uploaded file, so the same
+    file uploaded in several sessions is parsed and held only once. Sessions
+    must not modify the stored frames in place; they take a shallow
+    copy-on-write copy with `checkout()`. When the in-memory total goes over
+    the memory limit, the least recently used datasets are spilled to
+    uncompressed Arrow IPC files and memory-mapped back on the next access.
+
+    Spilling and reloading happen outside the store lock: the entry is only
+    marked as spilling or loading, so other sessions are not blocked by
+    another session's disk I/O. Spill files live in a directory of the
+    server process, deleted when a dataset is loaded back and at exit. At
+    most `max_spilled` datasets are kept on disk; older ones are dropped
+    from the store and parsed again from the upload when needed.
+    """
+
+    def __init__(self, memory_limit_bytes, spill_dir=DEFAULT_SPILL_DIR, max_spilled=DEFAULT_MAX_SPILLED):
+        """
+        Initialize an empty DatasetStore.
+
+        Parameters:
+        memory_limit_bytes (int): Maximum total size of the datasets kept in memory.
+        spill_dir (str): Directory for spilled datasets.
+        max_spilled (int): Maximum number of datasets kept on disk.
+        """
+        self.memory_limit_bytes = memory_limit_bytes
+        self.spill_dir = spill_dir
+        self.max_spilled = max_spilled
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)  # Notified when a spill or reload finishes
+        # key -> {"df", "nbytes", "path", "sketch", "state"}, least recently used first;
+        # state is None, "spilling" or "loading" while disk I/O runs outside the lock
+        self._entries = OrderedDict()
+        sweep_stale_dirs(spill_dir)  # Spill files of server processes that did not exit cleanly
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def put(self, key, loader, sketch=None):
+        """
+        Add a dataset to the store unless one with the same key already exists.
+
+        Parameters:
+        key (str): Content hash of the dataset.
+        loader (callable): Function returning the DataFrame, only called on a miss.
+        sketch (DatasetSketch): Column sketches filled in by the loader, kept with the dataset.
+
+        Returns:
+        str: The key of the stored dataset.
+        """
+        if key in self:
+            self.get(key)  # Mark as recently used
+            return key
+
+        # Parse outside the lock so other sessions are not blocked
+        df = loader()
+        nbytes = int(df.memory_usage(deep=True).sum())
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = {"df": df, "nbytes": nbytes, "path": None, "sketch": sketch, "state": None}
+            self._entries.move_to_end(key)
+            victims = self._select_victims(keep=key)
+        self._spill(victims)
+        return key
+
+    def get(self, key):
+        """
+        Return the shared base DataFrame of a dataset, loading it back if spilled.
+
+        The returned frame is shared and must be treated as read-only.
+
+        Parameters:
+        key (str): Content hash of the dataset.
+
+        Returns:
+        pd.DataFrame: The base DataFrame.
+        """
+        with self._lock:
+            while True:
+                entry = self._entries[key]  # KeyError if the dataset was dropped from disk
+                self._entries.move_to_end(key)
+                if entry["df"] is not None:
+                    return entry["df"]
+                if entry["state"] is None:
+                    break
+                self._changed.wait()  # Another session is loading it back
+            entry["state"] = "loading"
+            victims = self._select_victims(keep=key, reserve=entry["nbytes"])
+        self._spill(victims)
+
+        try:
+            df, nbytes = _read_spilled(entry["path"])
+        except Exception:
+            with self._lock:
+                entry["state"] = None
+                self._changed.notify_all()
+            raise
+        with self._lock:
+            path = entry["path"]
+            entry.update(df=df, nbytes=nbytes, path=None, state=None)
+            self._changed.notify_all()
+        _remove_file(path)  # The mapping stays valid after the file is unlinked
+        return df
+
+    def sketch(self, key):
+        """
+        Return the column sketches of a dataset, without loading it back if spilled.
+
+        The returned sketch is shared and must be treated as read-only.
+
+        Parameters:
+        key (str): Content hash of the dataset.
+
+        Returns:
+        DatasetSketch: The sketch, or None if the dataset was stored without one.
+        """
+        with self._lock:
+            return self._entries[key]["sketch"]
+
+    def checkout(self, key):
+        """
+        Return a session-private copy-on-write view of a dataset.
+
+        Parameters:
+        key (str): Content hash of the dataset.
+
+        Returns:
+        pd.DataFrame: A shallow copy that shares data with the base frame until modified.
+        """
+        return self.get(key).copy(deep=False)
+
+    def memory_usage(self):
+        """
+        Return the total size of the datasets currently held in memory.
+
+        Returns:
+        int: Size in bytes.
+        """
+        with self._lock:
+            return sum(entry["nbytes"] for entry in self._entries.values() if entry["df"] is not None)
+
+    def _select_victims(self, keep, reserve=0):
+        """
+        Pick the least recently used datasets to spill until the rest, plus `reserve` bytes, fit the limit.
+
+        Called with the lock held; the picked entries are marked as spilling
+        and written by _spill() once the lock is released.
+        """
+        usage = sum(
+            entry["nbytes"] for entry in self._entries.values()
+            if entry["df"] is not None and entry["state"] != "spilling"
+        )
+        victims = []
+        for key, entry in self._entries.items():
+            if usage + reserve <= self.memory_limit_bytes:
+                break
+            if key == keep or entry["df"] is None or entry["state"] is not None:
+                continue
+            entry["state"] = "spilling"
+            victims.append((key, entry))
+            usage -= entry["nbytes"]
+        return victims
+
+    def _spill(self, victims):
+        """Write the picked datasets to disk outside the lock, then release them from memory."""
+        for key, entry in victims:
+            path = entry["path"]
+            if path is None:
+                path = os.path.join(process_dir(self.spill_dir), f"{key}.arrow")
+                try:
+                    write_arrow_ipc(entry["df"], path)
+                except Exception:
+                    # Keep the dataset in memory rather than fail another session's upload
+                    _remove_file(path)
+                    with self._lock:
+                        entry["state"] = None
+                        self._changed.notify_all()
+                    continue
+            with self._lock:
+                entry.update(df=None, path=path, state=None)
+                dropped = self._drop_spilled()
+                self._changed.notify_all()
+            for dropped_path in dropped:
+                _remove_file(dropped_path)
+
+    def _drop_spilled(self):
+        """Drop the least recently used spilled datasets beyond max_spilled and return their files."""
+        spilled = [key for key, entry in self._entries.items() if entry["df"] is None and entry["state"] is None]
+        return [self._entries.pop(key)["path"] for key in spilled[:max(0, len(spilled) - self.max_spilled)]]
+
+@st.cache_resource
+def get_dataset_store():
+    """
+    Return the DatasetStore shared by every session of this server process.
+
+    The memory limit, spill directory and number of spilled datasets are read
+    from the VISWALIS_STORE_MEMORY_MB, VISWALIS_SPILL_DIR and
+    VISWALIS_SPILL_MAX_DATASETS environment variables.
+    """
+    memory_limit_mb = int(os.getenv("VISWALIS_STORE_MEMORY_MB") or DEFAULT_MEMORY_LIMIT_MB)
+    spill_dir = os.getenv("VISWALIS_SPILL_DIR") or DEFAULT_SPILL_DIR
+    max_spilled = int(os.getenv("VISWALIS_SPILL_MAX_DATASETS") or DEFAULT_MAX_SPILLED)
+    return DatasetStore(memory_limit_mb * 1024 * 1024, spill_dir, max_spilled)
@@ -0,0 +1,218 @@
+import gzip
+import io
+import os
+import tempfile
+import pyarrow as pa
+import pyarrow.parquet as pq
+from pandas.api.types import infer_dtype
+import streamlit as st
+
+from utils.perf_utils import section
+
+try:
+    import zstandard
+except ImportError:  # zstd CSV export is optional
+    zstandard = None
+
+EXPORT_DIR = os.path.join(tempfile.gettempdir(), "viswalis_exports")
+CHUNK_ROWS = 100_000
+MAX_EXPORT_FILES = 32
+
+EXPORT_FORMATS = {
+    "CSV": {"extension": ".csv", "mime": "text/csv"},
+    "CSV (gzip)": {"extension": ".csv.gz", "mime": "application/gzip"},
+    "CSV (zstd)": {"extension": ".csv.zst", "mime": "application/zstd"},
+    "Parquet": {"extension": ".parquet", "mime": "application/vnd.apache.parquet"},
+    "Arrow IPC": {"extension": ".arrow", "mime": "application/vnd.apache.arrow.file"},
+}
+
+def available_formats():
+    """
+    Return the export formats supported by the installed libraries.
+
+    Returns:
+    list: Names of the usable formats in EXPORT_FORMATS.
+    """
+    return [fmt for fmt in EXPORT_FORMATS if fmt != "CSV (zstd)" or zstandard is not None]
+
+def iter_chunks(df, chunk_rows=CHUNK_ROWS):
+    """
+    Yield consecutive row slices of a DataFrame.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame to slice.
+    chunk_rows (int): Number of rows per slice.
+    """
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+def _write_csv(df, raw, chunk_rows):
+    """Write the DataFrame as CSV text, chunk by chunk, to a binary stream."""
+    text = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+    for i, chunk in enumerate(iter_chunks(df, chunk_rows)):
+        chunk.to_csv(text, header=(i == 0), index=False)
+    text.flush()
+    text.detach()
+
+def arrow_schema(df):
+    """
+    Build one Arrow schema for the whole DataFrame.
+
+    Inferring the schema from the first chunk fails on columns that are
+    all-null early on or hold mixed types, so object columns are inferred
+    over all their values. All-null object columns become strings, and
+    mixed-type object columns are written as text.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame to write.
+
+    Returns:
+    tuple: (pa.Schema, list of the columns to convert to text).
+    """
+    schema = pa.Schema.from_pandas(df.iloc[:0], preserve_index=False).remove_metadata()
+    text_columns = []
+    for i, (column, values) in enumerate(df.items()):
+        if values.dtype != object:
+            continue
+        inferred = infer_dtype(values, skipna=True)
+        if inferred == "empty":
+            field_type = pa.string()
+        elif inferred.startswith("mixed") and inferred != "mixed-integer-float":
+            field_type = pa.string()
+            text_columns.append(column)
+        else:
+            try:
+                field_type = pa.infer_type(values, from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                field_type = pa.string()
+                text_columns.append(column)
+        schema = schema.set(i, schema.field(i).with_type(field_type))
+    return schema, text_columns
+
+def _to_table(chunk, schema, text_columns):
+    """Convert a chunk to an Arrow table with the given schema."""
+    if text_columns:
+        chunk = chunk.assign(**{
+            column: chunk[column].astype(str).where(chunk[column].notna(), None) for column in text_columns
+        })
+    return pa.Table.from_pandas(chunk, schema=schema, preserve_index=False)
+
+def _write_arrow(df, writer_factory, chunk_rows):
+    """Convert the DataFrame to Arrow tables chunk by chunk and write them."""
+    schema, text_columns = arrow_schema(df)
+    with writer_factory(schema) as writer:
+        for chunk in iter_chunks(df, chunk_rows):
+            writer.write_table(_to_table(chunk, schema, text_columns))
+
+def write_arrow_ipc(df, path, compression=None, chunk_rows=CHUNK_ROWS):
+    """
+    Stream a DataFrame to an Arrow IPC file.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame to write.
+    path (str): Destination file path.
+    compression (str): Buffer compression codec, or None to allow zero-copy memory mapping.
+    chunk_rows (int): Number of rows converted per chunk.
+    """
+    options = pa.ipc.IpcWriteOptions(compression=compression)
+    _write_arrow(df, lambda schema: pa.ipc.new_file(path, schema, options=options), chunk_rows)
+
+def write_export(df, path, fmt, chunk_rows=CHUNK_ROWS):
+    """
+    Stream a DataFrame to a file in the requested format.
+
+    Rows are converted and written in chunks, so no single in-memory copy
+    of the whole encoded file is ever built.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame to export.
+    path (str): Destination file path.
+    fmt (str): One of the keys of EXPORT_FORMATS.
+    chunk_rows (int): Number of rows converted per chunk.
+
+    Returns:
+    str: The path of the written file.
+    """
+    if fmt == "CSV":
+        with open(path, "wb") as raw:
+            _write_csv(df, raw, chunk_rows)
+    elif fmt == "CSV (gzip)":
+        with gzip.open(path, "wb", compresslevel=6) as raw:
+            _write_csv(df, raw, chunk_rows)
+    elif fmt == "CSV (zstd)":
+        if zstandard is None:
+            raise ValueError("zstd export requires the 'zstandard' package.")
+        with open(path, "wb") as fh, zstandard.ZstdCompressor(level=3).stream_writer(fh) as raw:
+            _write_csv(df, raw, chunk_rows)
+    elif fmt == "Parquet":
+        _write_arrow(df, lambda schema: pq.ParquetWriter(path, schema, compression="zstd"), chunk_rows)
+    elif fmt == "Arrow IPC":
+        write_arrow_ipc(df, path, compression="zstd" if pa.Codec.is_available("zstd") else None, chunk_rows=chunk_rows)
+    else:
+        raise ValueError(f"Unsupported export format '{fmt}'.")
+    return path
+
+def _prune_exports(keep):
+    """Delete the oldest export files so at most `keep` remain on disk."""
+    files = [os.path.join(EXPORT_DIR, name) for name in os.listdir(EXPORT_DIR)]
+    files.sort(key=os.path.getmtime, reverse=True)
+    for path in files[keep:]:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+@st.cache_resource(max_entries=MAX_EXPORT_FILES, show_spinner=False)
+def export_dataset(_df, version, fmt):
+    """
+    Export a dataset state to a temporary file, cached per (version, format).
+
+    Parameters:
+    _df (pd.DataFrame): The DataFrame to export (not hashed).
+    version (str): Version token of the dataset state.
+    fmt (str): One of the keys of EXPORT_FORMATS.
+
+    Returns:
+    str: Path of the exported file.
+    """
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    path = os.path.join(EXPORT_DIR, f"{version}{EXPORT_FORMATS[fmt]['extension']}")
+    write_export(_df, path, fmt)
+    _prune_exports(MAX_EXPORT_FILES)
+    return path
+
+def download_panel(df, version, file_name, key="export"):
+    """
+    Display the export controls for the current dataset.
+
+    The file is only generated after the user asks for it, and is reused
+    for as long as the dataset version does not change.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame to export.
+    version (str): Version token of the current dataset state.
+    file_name (str): Base name of the downloaded file (without extension).
+    key (str): Prefix for the widget keys.
+    """
+    with st.popover("Download"):
+        fmt = st.selectbox("Format:", available_formats(), key=f"{key}_format")
+
+        # The download button holds the whole file in memory, so it only
+        # exists in the rerun where the file was prepared
+        if st.button("Prepare File", key=f"{key}_prepare"):
+            try:
+                with st.spinner("Preparing your file..."), section(f"export.{fmt}"):
+                    path = export_dataset(df, version, fmt)
+                    if not os.path.exists(path):  # Pruned since it was cached
+                        path = write_export(df, path, fmt)
+            except Exception as e:
+                st.error(f"Error: {str(e)}")
+                return
+            with open(path, "rb") as fh:
+                st.download_button(
+                    label=f"Download {fmt}",
+                    data=fh,
+                    file_name=f"{file_name}{EXPORT_FORMATS[fmt]['extension']}",
+                    mime=EXPORT_FORMATS[fmt]["mime"],
+                    key=f"{key}_download",
+                )
@@ -0,0 +1,152 @@
+import io
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+from pandas.core.dtypes.cast import find_common_type
+
+from utils.sketches import DatasetSketch, SKETCH_CHUNK_ROWS
+
+# Extensions accepted by the uploader (compressed files are matched on their last suffix)
+UPLOAD_TYPES = ["csv", "gz", "zst", "parquet", "jsonl", "ndjson"]
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".zst": "zstd"}
+SOURCE_COLUMN = "source_file"
+
+def read_file(name, data, sketch=None, chunk_rows=SKETCH_CHUNK_ROWS):
+    """
+    Parse one file into a DataFrame based on its extension.
+
+    Supports CSV and JSON Lines (optionally gzip/zstd compressed) and Parquet.
+    When a sketch is given, CSV and JSON Lines are parsed in chunks and the
+    sketch is updated as each chunk comes in.
+
+    Parameters:
+    name (str): File name, used to pick the parser.
+    data (bytes): File contents.
+    sketch (DatasetSketch): Column sketches to update with the parsed rows.
+    chunk_rows (int): Rows per chunk when sketching.
+
+    Returns:
+    pd.DataFrame: The parsed file.
+    """
+    base, suffix = os.path.splitext(name.lower())
+    compression = COMPRESSION_SUFFIXES.get(suffix)
+    if compression is not None:
+        base, suffix = os.path.splitext(base)
+
+    buffer = io.BytesIO(data)
+    chunksize = chunk_rows if sketch is not None else None
+    if suffix == ".csv":
+        parsed = pd.read_csv(buffer, compression=compression, chunksize=chunksize)
+    elif suffix in (".jsonl", ".ndjson"):
+        parsed = pd.read_json(buffer, lines=True, compression=compression, chunksize=chunksize)
+    elif suffix == ".parquet" and compression is None:
+        df = pd.read_parquet(buffer)
+        if sketch is not None:
+            sketch.merge(DatasetSketch.from_frame(df, chunk_rows))
+        return df
+    else:
+        raise ValueError(f"Unsupported file type: '{name}'.")
+
+    if sketch is None:
+        return parsed  # Without a chunk size the parser returns the DataFrame
+
+    chunks = []
+    with parsed:
+        for chunk in parsed:
+            sketch.update(chunk)
+            chunks.append(chunk)
+    if not chunks:
+        # No rows: parse again without chunks to keep the header's columns
+        df = read_file(name, data)
+        sketch.update(df)
+        return df
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+def _common_dtype(dtypes, has_missing):
+    """Pick the dtype every shard of a column can be promoted to."""
+    if len(set(dtypes)) == 1 and not has_missing:
+        return dtypes[0]
+    if all(ptypes.is_numeric_dtype(d) and not ptypes.is_bool_dtype(d) for d in dtypes):
+        # Unlike np.result_type, this also promotes nullable extension types (Int64 with int64 is Int64)
+        dtype = find_common_type(dtypes)
+        # Shards without the column are filled with NaN, which NumPy integers cannot hold
+        return np.dtype("float64") if has_missing and isinstance(dtype, np.dtype) and dtype.kind in "iu" else dtype
+    if len(set(dtypes)) == 1:
+        return dtypes[0]
+    return np.dtype("object")
+
+def align_schemas(frames):
+    """
+    Promote every shard to a common schema before concatenation.
+
+    Columns are the union of all shard columns. A column with numeric
+    dtypes in every shard is promoted to their common numeric type; any
+    other mix of dtypes falls back to object. Only the columns whose
+    dtype changes are converted.
+
+    Parameters:
+    frames (list): The parsed shards.
+
+    Returns:
+    list: The shards with aligned dtypes.
+    """
+    columns = {}
+    for frame in frames:
+        for column, dtype in frame.dtypes.items():
+            columns.setdefault(column, []).append(dtype)
+
+    targets = {
+        column: _common_dtype(dtypes, has_missing=len(dtypes) < len(frames))
+        for column, dtypes in columns.items()
+    }
+
+    aligned = []
+    for frame in frames:
+        changed = {column: targets[column] for column, dtype in frame.dtypes.items() if dtype != targets[column]}
+        aligned.append(frame.astype(changed) if changed else frame)
+    return aligned
+
+def load_files(files, max_workers=None, sketch=None):
+    """
+    Parse several files concurrently and concatenate them into one DataFrame.
+
+    Parameters:
+    files (list): (name, bytes) pairs.
+    max_workers (int): Size of the parsing thread pool (default: one per file, up to the CPU count).
+    sketch (DatasetSketch): Column sketches to fill in while parsing. Every
+    file is sketched by its own worker and the sketches are merged in file order.
+
+    Returns:
+    pd.DataFrame: All rows in file order. When more than one file is given,
+    a categorical `source_file` column records where each row came from.
+    """
+    names = [name for name, _ in files]
+    if max_workers is None:
+        max_workers = min(len(files), os.cpu_count() or 1)
+
+    shard_sketches = [DatasetSketch() if sketch is not None else None for _ in files]
+
+    # pandas and pyarrow parsers release the GIL, so threads parse in parallel
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="viswalis-ingest") as pool:
+        frames = list(pool.map(lambda item, shard_sketch: read_file(*item, sketch=shard_sketch), files, shard_sketches))
+
+    if sketch is not None:
+        for shard_sketch in shard_sketches:
+            sketch.merge(shard_sketch)
+
+    if len(frames) == 1:
+        return frames[0]
+
+    df = pd.concat(align_schemas(frames), ignore_index=True)
+    categories = list(dict.fromkeys(names))
+    df[SOURCE_COLUMN] = pd.Categorical.from_codes(
+        np.repeat([categories.index(name) for name in names], [len(frame) for frame in frames]),
+        categories=categories,
+    )
+    if sketch is not None:
+        sketch.columns.pop(SOURCE_COLUMN, None)  # The added column replaces any column of that name
+        source_sketch = DatasetSketch.from_frame(df[[SOURCE_COLUMN]])
+        sketch.columns[SOURCE_COLUMN] = source_sketch[SOURCE_COLUMN]
+    return df
@@ -0,0 +1,165 @@
+import contextlib
+import functools
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+DEFAULT_LOG_PATH = os.path.join(tempfile.gettempdir(), "viswalis_profile.jsonl")
+_NULL_SECTION = contextlib.nullcontext()
+
+def profiling_enabled():
+    """
+    Return whether reruns of this session are being profiled.
+
+    Profiling is switched on from the sidebar debug panel, or for every
+    session with the VISWALIS_PROFILE environment variable.
+    """
+    return st.session_state.get("profile_reruns", False)
+
+def current_rss_mb():
+    """
+    Return the resident set size of the server process, if it can be read.
+
+    Returns:
+    float: RSS in MB, or None on platforms without /proc.
+    """
+    try:
+        with open("/proc/self/statm") as fh:
+            pages = int(fh.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+def peak_rss_mb():
+    """
+    Return the peak resident set size of the server process.
+
+    Returns:
+    float: Peak RSS in MB, or None if the platform does not report it.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+@contextlib.contextmanager
+def _timed_section(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        st.session_state._profile_sections.append({
+            "name": name,
+            "seconds": time.perf_counter() - start,
+            "rss_mb": current_rss_mb(),
+        })
+
+def section(name):
+    """
+    Time a named section of the current rerun.
+
+    When profiling is off this returns a shared no-op context manager, so
+    instrumented code pays for a single session state lookup.
+
+    Parameters:
+    name (str): Name of the section, e.g. "dashboard.render".
+    """
+    if not profiling_enabled():
+        return _NULL_SECTION
+    return _timed_section(name)
+
+def profiled(name):
+    """
+    Decorator timing every call of a function as a named section.
+
+    Parameters:
+    name (str): Name of the section.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with section(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def start_rerun():
+    """
+    Begin profiling a rerun. Call once at the top of the script.
+    """
+    if os.getenv("VISWALIS_PROFILE"):
+        st.session_state.profile_reruns = True
+    st.session_state._profile_start = time.perf_counter()
+    if "_profile_sections" not in st.session_state:
+        st.session_state._profile_sections = []
+
+def finish_rerun(df=None):
+    """
+    Record the profile of the rerun. Call once at the end of the script.
+
+    The record is appended as one JSON line to the profile log
+    (VISWALIS_PROFILE_LOG, default: viswalis_profile.jsonl in the temp dir).
+    Sections timed by fragment reruns are reported with the next full rerun.
+
+    Parameters:
+    df (pd.DataFrame): The session's current DataFrame, to report its memory.
+
+    Returns:
+    dict: The rerun record, or None if profiling is off.
+    """
+    if not profiling_enabled():
+        return None
+
+    # Take the sections, so that fragment reruns start a fresh list
+    sections = st.session_state._profile_sections
+    st.session_state._profile_sections = []
+
+    ctx = get_script_run_ctx()
+    record = {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        "session_id": ctx.session_id if ctx else None,
+        "total_seconds": time.perf_counter() - st.session_state._profile_start,
+        "sections": sections,
+        "rss_mb": current_rss_mb(),
+        "peak_rss_mb": peak_rss_mb(),
+        "df_rows": None if df is None else len(df),
+        "df_mb": None if df is None else df.memory_usage(index=True, deep=True).sum() / (1024 * 1024),
+    }
+
+    log_path = os.getenv("VISWALIS_PROFILE_LOG") or DEFAULT_LOG_PATH
+    try:
+        with open(log_path, "a") as fh:
+            fh.write(json.dumps(record) + "\n")
+    except OSError:
+        pass
+    return record
+
+def debug_panel(record):
+    """
+    Display the profile of the last rerun in the sidebar.
+
+    Parameters:
+    record (dict): The record returned by finish_rerun().
+    """
+    st.caption(f"Rerun: {record['total_seconds'] * 1000:,.1f} ms")
+    if record["sections"]:
+        st.dataframe(
+            [{"section": s["name"], "ms": round(s["seconds"] * 1000, 1)} for s in record["sections"]],
+            hide_index=True,
+            use_container_width=True,
+        )
+    memory = [f"RSS {record['rss_mb']:,.0f} MB" if record["rss_mb"] is not None else None,
+              f"peak {record['peak_rss_mb']:,.0f} MB" if record["peak_rss_mb"] is not None else None,
+              f"DataFrame {record['df_mb']:,.1f} MB" if record["df_mb"] is not None else None]
+    st.caption(" · ".join(m for m in memory if m))
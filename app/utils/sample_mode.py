@@ -0,0 +1,134 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import streamlit as st
+
+from utils.data_cleaner import DataCleaner
+
+DEFAULT_SAMPLE_SIZE = 10_000
+
+def sample_dataset(df, size, stratify=None, random_state=0):
+    """
+    Draw a random or stratified sample of rows from a DataFrame.
+
+    Parameters:
+    df (pd.DataFrame): The DataFrame to sample.
+    size (int): Approximate number of rows in the sample.
+    stratify (str): Column whose value proportions are kept (default: plain random sample).
+    random_state (int): Seed for reproducible samples.
+
+    Returns:
+    pd.DataFrame: The sampled rows, in their original order.
+    """
+    if size >= len(df):
+        return df
+    if stratify is None:
+        sample = df.sample(n=size, random_state=random_state)
+    else:
+        sample = (
+            df.groupby(stratify, group_keys=False, dropna=False, observed=True)
+            .sample(frac=size / len(df), random_state=random_state)
+        )
+    return sample.sort_index()
+
+@st.cache_resource
+def get_replay_executor():
+    """
+    Return the worker pool that replays cleaning steps on full datasets.
+
+    The pool is shared by every session; its size is read from the
+    VISWALIS_REPLAY_WORKERS environment variable.
+    """
+    max_workers = int(os.getenv("VISWALIS_REPLAY_WORKERS") or 2)
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="viswalis-replay")
+
+def _replay(df, steps):
+    """Replay steps on a full DataFrame."""
+    return DataCleaner(df).apply_steps(steps).get_cleaned_data()
+
+class FullReplay:
+    """
+    Replay of a session's cleaning steps on its full dataset, in the background.
+
+    At most one job of a session runs at a time, so no worker of the shared
+    pool ever waits on another job of the same session. Steps recorded while
+    a job runs are queued, and a done-callback submits them together as the
+    next job, starting from the result of the last one. Only that latest
+    result is kept; finished jobs are released.
+    """
+
+    def __init__(self, base):
+        """
+        Parameters:
+        base (pd.DataFrame): The full dataset before any of the recorded steps.
+        """
+        self.base = base
+        self.steps = 0  # Steps recorded
+        self.replayed = 0  # Steps applied to the latest result
+        self.error = None  # Exception of a failed job; nothing more is replayed after it
+        self._result = None
+        self._pending = []
+        self._running = False
+        self._cancelled = False
+        self._lock = threading.RLock()  # Reentrant: a job may finish before its callback is added
+
+    def add(self, steps):
+        """
+        Record steps to replay after the previous ones.
+
+        Parameters:
+        steps (list): (method name, keyword arguments) pairs for DataCleaner.
+        """
+        with self._lock:
+            self._pending.extend(steps)
+            self.steps += len(steps)
+            if not self._running:
+                self._submit()
+
+    def _submit(self):
+        if self._cancelled or self.error is not None or not self._pending:
+            return
+        steps, self._pending = self._pending, []
+        df = self.base if self._result is None else self._result
+        self._running = True
+        future = get_replay_executor().submit(_replay, df, steps)
+        future.add_done_callback(lambda future: self._finished(future, len(steps)))
+
+    def _finished(self, future, count):
+        with self._lock:
+            self._running = False
+            if self._cancelled:
+                return
+            try:
+                self._result = future.result()
+            except Exception as e:
+                self.error = e
+                return
+            self.replayed += count
+            self._submit()
+
+    def done(self):
+        """Whether every recorded step has been replayed (or a step failed)."""
+        with self._lock:
+            return self.error is not None or self.replayed == self.steps
+
+    def result(self):
+        """
+        Return the full dataset with every recorded step applied.
+
+        The error of a step that failed on the full data is raised instead.
+
+        Returns:
+        pd.DataFrame: The cleaned full dataset (the base if no step was recorded).
+        """
+        with self._lock:
+            if self.error is not None:
+                raise self.error
+            return self.base if self._result is None else self._result
+
+    def cancel(self):
+        """Stop submitting queued steps; a running job finishes but its result is dropped."""
+        with self._lock:
+            self._cancelled = True
+            self._pending = []
+            self._result = None
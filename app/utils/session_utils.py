@@ -0,0 +1,295 @@
+import os
+import uuid
+import streamlit as st
+
+from utils.chunked_cleaner import ChunkedDataCleaner
+from utils.data_cleaner import DataCleaner
+from utils.dataset_store import content_hash, get_dataset_store
+from utils.ingest import load_files
+from utils.perf_utils import section
+from utils.sample_mode import sample_dataset, FullReplay
+from utils.sketches import DatasetSketch
+
+# Cleaning steps that only drop rows; the sketch is then updated from the dropped rows
+ROW_DROPPING_STEPS = {"drop_duplicates", "remove_outliers"}
+
+def init_session_state():
+    """
+    Initialize the session state keys shared by the app tabs.
+    """
+    if 'df' not in st.session_state:
+        st.session_state.df = None
+    if 'df_version' not in st.session_state:
+        st.session_state.df_version = None
+    if 'dataset_key' not in st.session_state:
+        st.session_state.dataset_key = None
+    if 'uploaded_file_name' not in st.session_state:
+        st.session_state.uploaded_file_name = None
+    if 'uploaded_file_ids' not in st.session_state:
+        st.session_state.uploaded_file_ids = None
+    if 'failed_upload_ids' not in st.session_state:
+        st.session_state.failed_upload_ids = None  # Files that failed to parse, so they are not parsed again
+    if 'cleaning_steps' not in st.session_state:
+        st.session_state.cleaning_steps = []
+    if 'sketch' not in st.session_state:
+        st.session_state.sketch = None  # DatasetSketch of the dataset version below
+        st.session_state.sketch_version = None
+    if 'ooc_cleaner' not in st.session_state:
+        st.session_state.ooc_cleaner = None  # ChunkedDataCleaner in out-of-core mode
+    if 'sample_mode' not in st.session_state:
+        reset_sample_mode()
+
+def reset_sample_mode():
+    """
+    Clear the sample mode state of the session.
+    """
+    if st.session_state.get("full_replay") is not None:
+        st.session_state.full_replay.cancel()
+    st.session_state.sample_mode = False
+    st.session_state.full_replay = None  # FullReplay of the recorded steps on the full dataset
+    st.session_state.sample_rows = None  # Rows in the sample before cleaning
+
+def uploaded_files_label(uploaded_files):
+    """
+    Return a short display name for a set of uploaded files.
+
+    Parameters:
+    uploaded_files (list): The files from st.file_uploader.
+
+    Returns:
+    str: The file name, or the first name and how many more were uploaded.
+    """
+    if len(uploaded_files) == 1:
+        return uploaded_files[0].name
+    return f"{uploaded_files[0].name} (+{len(uploaded_files) - 1} more)"
+
+def load_uploaded_files(uploaded_files):
+    """
+    Load uploaded files through the shared dataset store.
+
+    Several files are parsed concurrently and combined into one dataset.
+    The files are only parsed if no session has uploaded the same contents
+    before. The session keeps the dataset key and reads the shared base
+    frame until it makes its first change.
+
+    Parameters:
+    uploaded_files (list): The files from st.file_uploader.
+    """
+    files = [(uploaded_file.name, uploaded_file.getvalue()) for uploaded_file in uploaded_files]
+    with section("upload.hash"):
+        if len(files) == 1:
+            key = content_hash(files[0][1])
+        else:
+            key = content_hash("".join(name + content_hash(data) for name, data in files).encode())
+    store = get_dataset_store()
+    sketch = DatasetSketch()
+    with section("upload.parse"):
+        store.put(key, lambda: load_files(files, sketch=sketch), sketch=sketch)
+
+    st.session_state.dataset_key = key
+    st.session_state.sketch = store.sketch(key)
+    st.session_state.sketch_version = key
+    st.session_state.df = None
+    st.session_state.df_version = key  # Unmodified datasets share caches across sessions
+    st.session_state.uploaded_file_name = uploaded_files_label(uploaded_files)
+    st.session_state.uploaded_file_ids = [uploaded_file.file_id for uploaded_file in uploaded_files]
+    st.session_state.cleaning_steps = []
+    reset_sample_mode()
+    close_out_of_core()
+
+def start_out_of_core(path):
+    """
+    Open a file from the server's disk with the out-of-core cleaner.
+
+    Only a preview of the data is kept in the session; cleaning steps run
+    chunk by chunk over the on-disk dataset.
+
+    Parameters:
+    path (str): CSV, Parquet or Arrow file, or a directory of Parquet files.
+
+    Returns:
+    pd.DataFrame: The preview, now stored in the session.
+    """
+    cleaner = ChunkedDataCleaner(path)
+    close_out_of_core()
+    st.session_state.ooc_cleaner = cleaner
+    st.session_state.dataset_key = None
+    st.session_state.uploaded_file_name = os.path.basename(os.path.normpath(path))
+    st.session_state.cleaning_steps = []
+    reset_sample_mode()
+    return update_df(cleaner.preview())
+
+def close_out_of_core():
+    """
+    Leave out-of-core mode and delete the cleaner's intermediate files.
+    """
+    if st.session_state.ooc_cleaner is not None:
+        st.session_state.ooc_cleaner.close()
+        st.session_state.ooc_cleaner = None
+
+def get_df():
+    """
+    Return the current DataFrame of this session.
+
+    Sessions that have not changed their dataset get a copy-on-write view
+    of the shared base frame, so in-place edits never leak to other sessions.
+
+    Returns:
+    pd.DataFrame: The current DataFrame, or None if nothing is loaded.
+    """
+    if st.session_state.df is not None:
+        return st.session_state.df
+    if st.session_state.dataset_key is not None:
+        try:
+            return get_dataset_store().checkout(st.session_state.dataset_key)
+        except KeyError:
+            # The store dropped the spilled dataset: parse the uploaded files again
+            st.session_state.dataset_key = None
+            st.session_state.uploaded_file_ids = None
+            st.rerun()
+    return None
+
+def get_sketch():
+    """
+    Return the approximate column statistics of the current dataset.
+
+    Sketches are built while the files are parsed and kept up to date by
+    the cleaning steps. They are rebuilt from the DataFrame only when the
+    dataset changed some other way. In out-of-core mode they describe the
+    whole dataset on disk, not just the preview.
+
+    Returns:
+    DatasetSketch: The sketch, or None if nothing is loaded.
+    """
+    if st.session_state.ooc_cleaner is not None:
+        return st.session_state.ooc_cleaner.sketch()
+    if st.session_state.sketch_version != st.session_state.df_version:
+        df = get_df()
+        if df is None:
+            return None
+        with section("sketch.build"):
+            st.session_state.sketch = DatasetSketch.from_frame(df)
+        st.session_state.sketch_version = st.session_state.df_version
+    return st.session_state.sketch
+
+def _step_sketch(before, after, method, kwargs):
+    """
+    Update the session's sketch for a cleaning step.
+
+    Steps that only drop rows subtract the dropped rows from the sketch;
+    other steps re-sketch only the columns they rewrote.
+
+    Returns:
+    DatasetSketch: The sketch of `after`, or None if the session has no up-to-date sketch.
+    """
+    if st.session_state.sketch_version != st.session_state.df_version:
+        return None
+    sketch = st.session_state.sketch
+    drops_rows = method in ROW_DROPPING_STEPS or (
+        method == "handle_missing_values" and kwargs.get("strategy", "drop") == "drop"
+    )
+    with section("sketch.update"):
+        if drops_rows and before.index.is_unique and before.columns.equals(after.columns):
+            removed = before[~before.index.isin(after.index)]
+            # Every dropped duplicate still has its twin in the data
+            return sketch.without_rows(removed, after, distinct_unchanged=method == "drop_duplicates")
+        return sketch.refreshed(before, after)
+
+def update_df(df):
+    """
+    Store a new state of the dataset and give it a fresh version token.
+
+    The version token is what caches key on, so it has to change every
+    time the DataFrame changes (including in-place edits).
+
+    Parameters:
+    df (pd.DataFrame): The new DataFrame for this session.
+
+    Returns:
+    pd.DataFrame: The stored DataFrame.
+    """
+    st.session_state.df = df
+    st.session_state.df_version = uuid.uuid4().hex
+    return df
+
+def apply_step(df, method, **kwargs):
+    """
+    Apply a DataCleaner method to the DataFrame and record it as a step.
+
+    In sample mode the step is also replayed on the full dataset in the
+    background. In out-of-core mode the step runs on the on-disk dataset
+    and the session keeps its new preview.
+
+    Parameters:
+    df (pd.DataFrame): The current DataFrame.
+    method (str): Name of the DataCleaner method.
+    **kwargs: Arguments of the method.
+
+    Returns:
+    pd.DataFrame: The cleaned DataFrame, now stored in the session.
+    """
+    with section(f"clean.{method}"):
+        if st.session_state.ooc_cleaner is not None:
+            cleaned = getattr(st.session_state.ooc_cleaner, method)(**kwargs).preview()
+        else:
+            cleaned = getattr(DataCleaner(df), method)(**kwargs).get_cleaned_data()
+    # The out-of-core cleaner sketches the full dataset itself while writing it
+    sketch = _step_sketch(df, cleaned, method, kwargs) if st.session_state.ooc_cleaner is None else None
+    st.session_state.cleaning_steps.append((method, kwargs))
+
+    if st.session_state.sample_mode:
+        st.session_state.full_replay.add([(method, kwargs)])
+    update_df(cleaned)
+    if sketch is not None:
+        st.session_state.sketch = sketch
+        st.session_state.sketch_version = st.session_state.df_version
+    return cleaned
+
+def start_sample_mode(df, size, stratify=None):
+    """
+    Switch the session to work on a sample of its current DataFrame.
+
+    Parameters:
+    df (pd.DataFrame): The full DataFrame.
+    size (int): Number of rows to sample.
+    stratify (str): Column to stratify the sample on (default: random sample).
+
+    Returns:
+    pd.DataFrame: The sample, now stored in the session.
+    """
+    sample = sample_dataset(df, size, stratify)
+    reset_sample_mode()
+    st.session_state.sample_mode = True
+    st.session_state.full_replay = FullReplay(df)
+    st.session_state.sample_rows = len(sample)
+    return update_df(sample)
+
+def finish_sample_mode():
+    """
+    Switch the session to the full dataset once every step has been replayed.
+
+    If a step fails on the full data, the session leaves sample mode and
+    keeps the cleaned sample as its data, and the error is raised.
+
+    Returns:
+    dict: Row counts of the sample and the full dataset before and after
+    cleaning, or None if the replay is still running.
+    """
+    replay = st.session_state.full_replay
+    if not replay.done():
+        return None
+
+    try:
+        full = replay.result()
+    except Exception:
+        reset_sample_mode()
+        raise
+    summary = {
+        "sample_before": st.session_state.sample_rows,
+        "sample_after": len(st.session_state.df),
+        "full_before": len(replay.base),
+        "full_after": len(full),
+    }
+    reset_sample_mode()
+    update_df(full)
+    return summary
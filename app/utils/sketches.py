@@ -0,0 +1,492 @@
+import copy
+import numpy as np
+import pandas as pd
+from pandas.api import types as ptypes
+
+HLL_PRECISION = 12  # 4096 registers, about 1.6% standard error
+TDIGEST_COMPRESSION = 200
+SKETCH_CHUNK_ROWS = 100_000
+
+def _is_numeric(values):
+    return ptypes.is_numeric_dtype(values) and not ptypes.is_bool_dtype(values)
+
+def _hash_values(values):
+    """
+    Hash non-null values to uint64.
+
+    Numbers are hashed as floats, so 3 and 3.0 count as the same distinct
+    value even when shards were parsed with different dtypes.
+    """
+    if _is_numeric(values):
+        values = values.astype("float64")
+    return pd.util.hash_pandas_object(values, index=False).to_numpy()
+
+def _buffer(values):
+    """Return an array sharing memory with the data of a column, without copying."""
+    array = values.values
+    return array.codes if isinstance(array, pd.Categorical) else np.asarray(array)
+
+def _combine_moments(n_a, mean_a, m2_a, n_b, mean_b, m2_b):
+    """Combine the count, mean and sum of squared deviations of two parts (Chan et al.)."""
+    n = n_a + n_b
+    if n == 0:
+        return 0, 0.0, 0.0
+    delta = mean_b - mean_a
+    return n, mean_a + delta * n_b / n, m2_a + m2_b + delta * delta * n_a * n_b / n
+
+def _subtract_moments(n, mean, m2, n_b, mean_b, m2_b):
+    """Remove a part from combined moments, the inverse of _combine_moments()."""
+    n_a = n - n_b
+    if n_a <= 0:
+        return 0, 0.0, 0.0
+    mean_a = (n * mean - n_b * mean_b) / n_a
+    delta = mean_b - mean_a
+    return n_a, mean_a, max(m2 - m2_b - delta * delta * n_a * n_b / n, 0.0)
+
+class HyperLogLog:
+    """
+    Approximate distinct count of a stream of hashed values.
+
+    Sketches of different shards merge by taking the register-wise maximum.
+    """
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, hashes):
+        """
+        Add uint64 hashes to the sketch.
+
+        Parameters:
+        hashes (np.ndarray): Hashes of the values, from _hash_values().
+        """
+        if len(hashes) == 0:
+            return
+        p = self.precision
+        index = (hashes >> np.uint64(64 - p)).astype(np.intp)
+        rest = hashes & np.uint64((1 << (64 - p)) - 1)
+        # Bit length of the remaining bits, split in halves that floats represent exactly
+        high = (rest >> np.uint64(32)).astype(np.float64)
+        low = (rest & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        bit_length = np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+        rank = (64 - p + 1 - bit_length).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        """Merge another sketch with the same precision into this one."""
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self):
+        """
+        Return the estimated number of distinct values.
+
+        Returns:
+        int: The estimate, using linear counting for small cardinalities.
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.exp2(-self.registers.astype(np.float64)))
+        zeros = np.count_nonzero(self.registers == 0)
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * np.log(m / zeros)
+        return int(round(estimate))
+
+class TDigest:
+    """
+    Approximate quantiles of a stream of numbers (merging t-digest).
+
+    Values are summarized by weighted centroids that are small near the
+    tails and large in the middle, so extreme quantiles stay accurate.
+    Digests of different shards merge by compressing their centroids
+    together. The exact minimum and maximum are kept alongside.
+    """
+
+    def __init__(self, compression=TDIGEST_COMPRESSION):
+        self.compression = compression
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.min = np.nan
+        self.max = np.nan
+
+    @property
+    def total(self):
+        return float(self.weights.sum())
+
+    def update(self, values):
+        """
+        Add numbers to the digest.
+
+        Parameters:
+        values (np.ndarray): Finite float values.
+        """
+        if len(values) == 0:
+            return
+        self.min = np.fmin(self.min, values.min())
+        self.max = np.fmax(self.max, values.max())
+        self._compress(np.concatenate([self.means, values]), np.concatenate([self.weights, np.ones(len(values))]))
+
+    def merge(self, other):
+        """Merge another digest into this one."""
+        if len(other.means) == 0:
+            return
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        self._compress(np.concatenate([self.means, other.means]), np.concatenate([self.weights, other.weights]))
+
+    def _compress(self, means, weights):
+        """Merge neighbouring centroids that fall in the same unit of the k1 scale function."""
+        order = np.argsort(means, kind="stable")
+        means, weights = means[order], weights[order]
+        q = (np.cumsum(weights) - weights / 2) / weights.sum()
+        k = np.floor(self.compression / (2 * np.pi) * np.arcsin(2 * q - 1))
+        starts = np.flatnonzero(np.r_[True, np.diff(k) > 0])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q):
+        """
+        Return the approximate q-th quantile.
+
+        Parameters:
+        q (float or array): Quantile(s) between 0 and 1.
+
+        Returns:
+        float or np.ndarray: The quantile(s), or NaN if the digest is empty.
+        """
+        if len(self.means) == 0:
+            return np.full(np.shape(q), np.nan)[()]
+        positions = np.concatenate([[0.0], np.cumsum(self.weights) - self.weights / 2, [self.total]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return np.interp(np.asarray(q) * self.total, positions, values)[()]
+
+    def cdf(self, x):
+        """
+        Return the approximate fraction of values at or below x.
+
+        Parameters:
+        x (float or array): Value(s) to look up.
+        """
+        if len(self.means) == 0:
+            return np.full(np.shape(x), np.nan)[()]
+        positions = np.concatenate([[0.0], np.cumsum(self.weights) - self.weights / 2, [self.total]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return (np.interp(x, values, positions) / self.total)[()]
+
+class ColumnSketch:
+    """
+    Mergeable summary of one column: count, nulls, distinct values and,
+    for numeric columns, min/max, mean/variance and quantiles.
+    """
+
+    def __init__(self):
+        self.count = 0  # Non-null values
+        self.nulls = 0
+        self.numeric = None  # Unknown until the first non-null values are seen
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._hll = HyperLogLog()
+        self._digest = TDigest()
+        # After rows were removed, the values left in the column, from which the
+        # stale distinct count and quantiles are rebuilt on first use
+        self._remaining = None
+        self._hll_stale = False
+        self._digest_stale = False
+
+    @property
+    def hll(self):
+        """HyperLogLog of the non-null values, rebuilt first if rows were removed."""
+        if self._hll_stale:
+            hll = HyperLogLog(self._hll.precision)
+            for start in range(0, len(self._remaining), SKETCH_CHUNK_ROWS):
+                hll.update(_hash_values(self._remaining.iloc[start:start + SKETCH_CHUNK_ROWS].dropna()))
+            self.hll = hll
+        return self._hll
+
+    @hll.setter
+    def hll(self, hll):
+        self._hll, self._hll_stale = hll, False
+        self._release_remaining()
+
+    @property
+    def digest(self):
+        """TDigest of the numeric values, rebuilt first if rows were removed."""
+        if self._digest_stale:
+            digest = TDigest(self._digest.compression)
+            for start in range(0, len(self._remaining), SKETCH_CHUNK_ROWS):
+                digest.update(self._remaining.iloc[start:start + SKETCH_CHUNK_ROWS].dropna().to_numpy(dtype=np.float64))
+            self.digest = digest
+        return self._digest
+
+    @digest.setter
+    def digest(self, digest):
+        self._digest, self._digest_stale = digest, False
+        self._release_remaining()
+
+    def _release_remaining(self):
+        if not (self._hll_stale or self._digest_stale):
+            self._remaining = None
+
+    def update(self, values):
+        """
+        Add a chunk of the column to the sketch.
+
+        Parameters:
+        values (pd.Series): The chunk of the column.
+        """
+        present = values.dropna()
+        self.nulls += len(values) - len(present)
+        if len(present) == 0:
+            return
+
+        self.hll.update(_hash_values(present))
+        self._set_numeric(_is_numeric(present))
+        if self.numeric:
+            x = present.to_numpy(dtype=np.float64)
+            mean = x.mean()
+            self.count, self._mean, self._m2 = _combine_moments(
+                self.count, self._mean, self._m2, len(x), mean, float(((x - mean) ** 2).sum())
+            )
+            self.digest.update(x)
+        else:
+            self.count += len(present)
+
+    def merge(self, other):
+        """Merge the sketch of the same column in another shard into this one."""
+        self.nulls += other.nulls
+        self.hll.merge(other.hll)
+        if other.numeric is not None:
+            self._set_numeric(other.numeric)
+        if self.numeric:
+            self.count, self._mean, self._m2 = _combine_moments(
+                self.count, self._mean, self._m2, other.count, other._mean, other._m2
+            )
+            self.digest.merge(other.digest)
+        else:
+            self.count += other.count
+
+    def remove(self, removed, remaining, distinct_unchanged=False):
+        """
+        Update the sketch after rows were dropped from the column.
+
+        Counts, nulls, mean and variance are updated exactly from the
+        removed values. Distinct counts and quantiles (with min and max)
+        cannot be subtracted: when non-null values were removed they are
+        marked stale and rebuilt from the remaining values on first use,
+        so the columns nobody looks at are never sketched again.
+
+        Parameters:
+        removed (pd.Series): The dropped values.
+        remaining (pd.Series): The values left in the column.
+        distinct_unchanged (bool): Whether every dropped value is still in the column (e.g. duplicates).
+        """
+        present = removed.dropna()
+        self.nulls -= len(removed) - len(present)
+        if len(present):
+            if self.numeric:
+                x = present.to_numpy(dtype=np.float64)
+                mean = x.mean()
+                self.count, self._mean, self._m2 = _subtract_moments(
+                    self.count, self._mean, self._m2, len(x), mean, float(((x - mean) ** 2).sum())
+                )
+                self._digest_stale = True
+            else:
+                self.count -= len(present)
+            if not distinct_unchanged:
+                self._hll_stale = True
+        # A part left stale by an earlier removal is rebuilt from the latest values too
+        self._remaining = remaining if self._hll_stale or self._digest_stale else None
+
+    def _set_numeric(self, numeric):
+        """Record the column kind; a column with any non-numeric shard is not numeric."""
+        if self.numeric is None:
+            self.numeric = numeric
+        elif self.numeric and not numeric:
+            self.numeric = False
+            self._mean, self._m2 = 0.0, 0.0
+            self.digest = TDigest(self._digest.compression)
+
+    @property
+    def rows(self):
+        return self.count + self.nulls
+
+    @property
+    def null_fraction(self):
+        return self.nulls / self.rows if self.rows else 0.0
+
+    @property
+    def distinct(self):
+        """Approximate number of distinct non-null values."""
+        return min(self.hll.count(), self.count)
+
+    @property
+    def mean(self):
+        return self._mean if self.numeric and self.count else np.nan
+
+    @property
+    def variance(self):
+        """Sample variance (ddof=1, as in pandas)."""
+        return self._m2 / (self.count - 1) if self.numeric and self.count > 1 else np.nan
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    @property
+    def min(self):
+        return self.digest.min if self.numeric else np.nan
+
+    @property
+    def max(self):
+        return self.digest.max if self.numeric else np.nan
+
+    def quantile(self, q):
+        """Approximate q-th quantile of a numeric column (NaN otherwise)."""
+        if not self.numeric:
+            return np.full(np.shape(q), np.nan)[()]
+        return self.digest.quantile(q)
+
+    def iqr_bounds(self, factor=1.5):
+        """
+        Approximate the outlier bounds of the IQR method.
+
+        Returns:
+        tuple: (lower bound, upper bound, approximate fraction of values outside).
+        """
+        q1, q3 = self.quantile([0.25, 0.75])
+        lower, upper = q1 - factor * (q3 - q1), q3 + factor * (q3 - q1)
+        below, above = self.digest.cdf([lower, upper])
+        return lower, upper, below + (1 - above)
+
+class DatasetSketch:
+    """
+    Per-column sketches of a dataset, built chunk by chunk.
+
+    Sketches of different shards (files or chunks) merge into the sketch
+    of the concatenated dataset.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.columns = {}
+
+    @classmethod
+    def from_frame(cls, df, chunk_rows=SKETCH_CHUNK_ROWS):
+        """
+        Build the sketch of a DataFrame in chunks.
+
+        Parameters:
+        df (pd.DataFrame): The DataFrame.
+        chunk_rows (int): Rows per chunk.
+
+        Returns:
+        DatasetSketch: The sketch.
+        """
+        sketch = cls()
+        for start in range(0, len(df), chunk_rows):
+            sketch.update(df.iloc[start:start + chunk_rows])
+        if len(df) == 0:
+            sketch.update(df)
+        return sketch
+
+    def __contains__(self, column):
+        return column in self.columns
+
+    def __getitem__(self, column):
+        return self.columns[column]
+
+    def update(self, chunk):
+        """
+        Add a chunk of rows to the sketch.
+
+        Parameters:
+        chunk (pd.DataFrame): The chunk.
+        """
+        for column in self.columns:
+            if column not in chunk.columns:
+                self.columns[column].nulls += len(chunk)
+        for column, values in chunk.items():
+            if column not in self.columns:
+                self.columns[column] = ColumnSketch()
+                self.columns[column].nulls = self.rows
+            self.columns[column].update(values)
+        self.rows += len(chunk)
+
+    def merge(self, other):
+        """
+        Merge the sketch of the next shard into this one.
+
+        Columns missing from a shard count as nulls for its rows, as they
+        become after concatenation.
+        """
+        for column, sketch in self.columns.items():
+            if column not in other.columns:
+                sketch.nulls += other.rows
+        for column, sketch in other.columns.items():
+            if column not in self.columns:
+                self.columns[column] = ColumnSketch()
+                self.columns[column].nulls = self.rows
+            self.columns[column].merge(sketch)
+        self.rows += other.rows
+
+    def without_rows(self, removed, remaining, distinct_unchanged=False):
+        """
+        Return the sketch of the dataset after rows were dropped.
+
+        The sketch itself is left untouched, since it may be shared. The
+        column sketches are copied shallowly, since sketches are not updated
+        once built and their stale parts are replaced, not modified, when rebuilt.
+
+        Parameters:
+        removed (pd.DataFrame): The dropped rows.
+        remaining (pd.DataFrame): The rows left in the dataset.
+        distinct_unchanged (bool): Whether every dropped row still has a duplicate in the dataset.
+
+        Returns:
+        DatasetSketch: The updated sketch.
+        """
+        sketch = DatasetSketch()
+        sketch.rows = self.rows - len(removed)
+        for column, column_sketch in self.columns.items():
+            sketch.columns[column] = copy.copy(column_sketch)
+            sketch.columns[column].remove(removed[column], remaining[column], distinct_unchanged)
+        return sketch
+
+    def refreshed(self, before, after, chunk_rows=SKETCH_CHUNK_ROWS):
+        """
+        Return the sketch of the dataset after a step that keeps every row.
+
+        Columns of `after` that still share their data with a column of
+        `before` (unchanged, or only renamed) keep their sketch. Only the
+        columns the step rewrote are sketched again.
+
+        Parameters:
+        before (pd.DataFrame): The dataset this sketch describes.
+        after (pd.DataFrame): The dataset after the step.
+        chunk_rows (int): Rows per chunk when sketching a column.
+
+        Returns:
+        DatasetSketch: The updated sketch.
+        """
+        if len(before) != len(after) or not before.columns.is_unique or not after.columns.is_unique:
+            return DatasetSketch.from_frame(after, chunk_rows)
+
+        sketch = DatasetSketch()
+        sketch.rows = len(after)
+        for position, (column, values) in enumerate(after.items()):
+            # Match by name first, then by position for renamed columns
+            candidates = [column] if column in before.columns else []
+            if position < len(before.columns):
+                candidates.append(before.columns[position])
+            source = next(
+                (c for c in candidates if c in self.columns
+                 and np.may_share_memory(_buffer(before[c]), _buffer(values))),
+                None,
+            )
+            if source is not None:
+                sketch.columns[column] = self.columns[source]  # Sketches are never modified in place once built
+            else:
+                sketch.columns[column] = ColumnSketch()
+                for start in range(0, len(values), chunk_rows):
+                    sketch.columns[column].update(values.iloc[start:start + chunk_rows])
+        return sketch
@@ -0,0 +1,53 @@
+import atexit
+import os
+import shutil
+
+PROCESS_DIR_PREFIX = "pid-"
+
+def _is_running(pid):
+    """Whether a process with this id is running (assumed so where it cannot be checked)."""
+    if os.name != "posix":
+        return True  # os.kill() would terminate the process on Windows
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True  # e.g. running under another user
+    return True
+
+def sweep_stale_dirs(root):
+    """
+    Delete the per-process directories of root left behind by processes that are no longer running.
+
+    Parameters:
+    root (str): Directory holding per-process directories from process_dir().
+    """
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return
+    for name in names:
+        pid = name[len(PROCESS_DIR_PREFIX):]
+        if name.startswith(PROCESS_DIR_PREFIX) and pid.isdigit() and int(pid) != os.getpid() and not _is_running(int(pid)):
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+def process_dir(root):
+    """
+    Return the directory of root owned by this server process, creating it if needed.
+
+    The directory is deleted when the process exits. When it is created, the
+    directories left in root by processes that were killed are swept.
+
+    Parameters:
+    root (str): Parent directory.
+
+    Returns:
+    str: Path of the directory.
+    """
+    path = os.path.join(root, f"{PROCESS_DIR_PREFIX}{os.getpid()}")
+    if not os.path.isdir(path):
+        sweep_stale_dirs(root)
+        os.makedirs(path, exist_ok=True)
+        atexit.register(shutil.rmtree, path, True)
+    return path
@@ -1,6 +1,8 @@
 import time
 import streamlit as st
 
+from utils.session_utils import finish_sample_mode
+
 def progress_bar(progress_text):
     progress_bar = st.progress(0, text=progress_text)
     for percent_complete in range(100):
@@ -9,3 +11,64 @@ def progress_bar(progress_text):
     time.sleep(1)
 
     progress_bar.empty()
+
+@st.fragment(run_every=2)
+def sample_mode_status():
+    """
+    Show the progress of the full-data replay and switch over once it is done.
+
+    The switch happens on its own as soon as the last recorded step has been
+    replayed. Before any step is recorded, the button leaves sample mode.
+    """
+    replay = st.session_state.full_replay
+    st.caption(f"Working on a sample of {st.session_state.sample_rows:,} out of {len(replay.base):,} rows.")
+    if replay.steps:
+        st.progress(replay.replayed / replay.steps, text=f"Full data: {replay.replayed}/{replay.steps} steps replayed")
+
+    if st.button("Switch to Full Data", key="switch_to_full_data"):
+        st.session_state.switch_to_full = True
+
+    if st.session_state.get("switch_to_full") or (replay.steps and replay.done()):
+        try:
+            summary = finish_sample_mode()
+        except Exception as e:
+            st.session_state.switch_to_full = False
+            st.session_state.sample_error = f"Error replaying on the full data, keeping the cleaned sample: {str(e)}"
+            st.rerun()
+
+        if summary is None:
+            st.caption("Switching as soon as the full data is ready...")
+        else:
+            st.session_state.switch_to_full = False
+            st.session_state.sample_summary = summary
+            st.rerun()
+
+def column_stats_caption(sketch, column):
+    """
+    Show approximate statistics of the column selected in a column picker.
+
+    They are kept out of the option labels: Streamlit derives the widget ID
+    from the labels, so statistics that change after every cleaning step
+    would reset the picker to its first column.
+
+    Parameters:
+    sketch (DatasetSketch): Sketch of the current dataset, or None.
+    column (str): The selected column.
+    """
+    if sketch is None or column not in sketch:
+        return
+    column_sketch = sketch[column]
+    st.caption(f"{column_sketch.null_fraction:.1%} null · ≈{column_sketch.distinct:,} distinct")
+
+def outlier_bounds_caption(sketch, column):
+    """
+    Show the approximate IQR outlier bounds of a column before removing outliers.
+
+    Parameters:
+    sketch (DatasetSketch): Sketch of the current dataset, or None.
+    column (str): The selected column.
+    """
+    if sketch is None or column not in sketch or not sketch[column].numeric or not sketch[column].count:
+        return
+    lower, upper, outside = sketch[column].iqr_bounds()
+    st.caption(f"Approximate bounds: {lower:,.4g} to {upper:,.4g} · ≈{outside:.1%} of values outside")